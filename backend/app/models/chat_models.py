@@ -14,6 +14,7 @@ class ChatRequest(BaseModel):
     chat_history: List[ChatMessage] = []
     voice_id: Optional[str] = None
     timestamp: Optional[str] = None
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
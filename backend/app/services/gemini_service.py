@@ -1,9 +1,100 @@
 import os
+import json
+import logging
+import asyncio
+import time
+import hashlib
+import io
+import functools
+import jinja2
 import google.generativeai as genai
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from google.api_core import exceptions as google_exceptions
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.models.chat_models import ChatMessage
 
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+def _api_retrying() -> AsyncRetrying:
+    """Retry policy for transient Gemini failures (5xx, rate limits, timeouts)"""
+    return AsyncRetrying(
+        stop=stop_after_attempt(4),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception_type((
+            google_exceptions.ServiceUnavailable,
+            google_exceptions.TooManyRequests,
+            google_exceptions.DeadlineExceeded,
+            google_exceptions.InternalServerError,
+            TimeoutError,
+            ConnectionError
+        )),
+        reraise=True
+    )
+
+# Language instructions frozen at module scope so chat turns don't rebuild
+# the map per call
+_LANG_INSTRUCTIONS = {
+    'en-US': 'Please respond in English.',
+    'es-ES': 'Por favor responde en español.',
+    'fr-FR': 'Veuillez répondre en français.',
+    'de-DE': 'Bitte antworten Sie auf Deutsch.',
+    'it-IT': 'Si prega di rispondere in italiano.',
+    'pt-BR': 'Por favor, responda em português.',
+    'ru-RU': 'Пожалуйста, отвечайте на русском языке.',
+    'ja-JP': '日本語で回答してください。',
+    'ko-KR': '한국어로 답변해 주세요.',
+    'zh-CN': '请用中文回答。',
+    'ar-SA': 'يرجى الرد باللغة العربية.',
+    'hi-IN': 'कृपया हिंदी में उत्तर दें।'
+}
+
+# Prompt scaffolding compiled once at import - the instruction blocks are
+# hundreds of bytes of literal text that used to be re-interpolated per call
+_TEMPLATE_ENV = jinja2.Environment(autoescape=False)
+
+_CONTEXT_PROMPT_TEMPLATE = _TEMPLATE_ENV.from_string("""
+You are an AI assistant helping users understand and discuss a document.
+{{ language_instruction }}
+
+Here is the document content for reference:
+
+{{ context }}
+
+Instructions:
+- Answer questions based on the document content when possible
+- If information isn't in the document, clearly state that
+- Be helpful, accurate, and conversational
+- Provide specific references to document sections when relevant
+- If asked about topics not in the document, provide general helpful information but note it's not from the document
+- Format your responses clearly with proper paragraphs
+- Use **bold** for important terms and *italics* for emphasis
+- Use bullet points with - when listing items
+- Highlight numbers and percentages for better readability
+- Structure longer responses with clear sections
+""")
+
+_NO_CONTEXT_PROMPT_TEMPLATE = _TEMPLATE_ENV.from_string("""
+You are a helpful AI assistant.
+{{ language_instruction }}
+
+Instructions:
+- Provide helpful and accurate responses
+- Be conversational and friendly
+- If you don't know something, admit it honestly
+- Format your responses clearly with proper paragraphs
+- Use **bold** for important terms and *italics* for emphasis
+- Use bullet points with - when listing items
+- Highlight key numbers and information
+- Structure longer responses with clear sections
+""")
+
 class GeminiService:
     def __init__(self):
         # Configure Gemini API
@@ -20,17 +111,17 @@ class GeminiService:
         try:
             self.model = genai.GenerativeModel(self.model_name)
         except Exception as e:
-            print(f"Failed to load {self.model_name}, trying fallback models...")
+            logger.warning("Failed to load %s, trying fallback models...", self.model_name)
             fallback_models = ["gemini-1.5-flash", "gemini-1.5-pro", "gemini-pro"]
             
             for fallback in fallback_models:
                 try:
                     self.model = genai.GenerativeModel(fallback)
                     self.model_name = fallback
-                    print(f"Successfully loaded fallback model: {fallback}")
+                    logger.info("Successfully loaded fallback model: %s", fallback)
                     break
                 except Exception as fe:
-                    print(f"Failed to load {fallback}: {fe}")
+                    logger.warning("Failed to load %s: %s", fallback, fe)
                     continue
             else:
                 raise ValueError(f"Could not load any Gemini model. Last error: {e}")
@@ -43,33 +134,126 @@ class GeminiService:
             max_output_tokens=int(os.getenv("MAX_TOKENS", 1000))
         )
         
-        # Safety settings
-        self.safety_settings = [
-            {
-                "category": "HARM_CATEGORY_HARASSMENT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_HATE_SPEECH",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            },
-            {
-                "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-            }
-        ]
-    
+        # Safety settings in the SDK's native enum form - string dicts get
+        # run through a category/threshold resolver on every call, the enum
+        # dict is forwarded as-is
+        self.safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_MEDIUM_AND_ABOVE
+        }
+
+        # Response cache: identical prompts (re-summarized PDFs, repeated
+        # questions) skip the Gemini round-trip entirely. Persistent when
+        # diskcache is installed, plain in-process dict otherwise.
+        self.cache_ttl = int(os.getenv("GEMINI_CACHE_TTL", 86400))
+        if diskcache:
+            self._response_cache = diskcache.Cache(".gemini_cache")
+        else:
+            self._response_cache = {}
+
+        # Bound concurrent Gemini calls from the batch entry point so a big
+        # batch doesn't slam the API all at once
+        self._sem = asyncio.Semaphore(int(os.getenv("GEMINI_CONCURRENCY", 16)))
+
+        # Gemini context caches: the PDF text is uploaded once per document
+        # and referenced by handle on later turns, instead of re-sending the
+        # full context with every request. Maps context hash -> CachedContent
+        # (or None when the API rejected the content, e.g. below minimum size).
+        self._context_cache = {}
+
+        # In-flight CachedContent creations per context key, so concurrent
+        # first turns on the same document share one upload
+        self._context_creates = {}
+
+        # Live ChatSession per session_id: the SDK keeps the conversation
+        # state, so each turn sends only the new message instead of
+        # re-serializing the whole history. LRU-bounded - sessions hold
+        # their full history, so an uncapped map grows for the life of
+        # the process.
+        self._sessions = {}
+        self._max_sessions = int(os.getenv("GEMINI_MAX_SESSIONS", 256))
+
+    def _build_state_key(self, kind: str, message: str, context: str = "",
+                         language: str = "", chat_history: List[ChatMessage] = []) -> str:
+        """Build a deterministic cache key over everything that affects the response"""
+        state = {
+            'kind': kind,
+            'model': self.model_name,
+            'temperature': self.generation_config.temperature,
+            'max_output_tokens': self.generation_config.max_output_tokens,
+            'message': message,
+            'context': context[:2000],  # excerpt is enough to discriminate documents
+            'language': language,
+            'history': [(m.role, m.content) for m in chat_history[-10:]]
+        }
+        canonical = json.dumps(state, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(canonical.encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        """Look up a cached response, honoring TTL for the dict fallback"""
+        if diskcache:
+            return self._response_cache.get(key)
+
+        entry = self._response_cache.get(key)
+        if entry:
+            expires_at, value = entry
+            if time.time() < expires_at:
+                return value
+            del self._response_cache[key]
+        return None
+
+    def _cache_set(self, key: str, value: str):
+        """Store a response in the cache"""
+        if diskcache:
+            self._response_cache.set(key, value, expire=self.cache_ttl)
+        else:
+            self._response_cache[key] = (time.time() + self.cache_ttl, value)
+
+    async def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """Truncate text to a token budget using the model tokenizer.
+
+        len() counts codepoints, not tokens - Hindi/Chinese/Japanese text can
+        carry several times more tokens per character than Latin text, so a
+        character cap lets the real request size overshoot badly. Cuts
+        proportionally and shrinks until the prefix fits; falls back to a
+        rough character slice if the tokenizer is unavailable.
+        """
+        try:
+            total = (await self.model.count_tokens_async(text)).total_tokens
+            if total <= max_tokens:
+                return text
+
+            # The proportional cut lands close, so this rarely loops twice
+            cut = max(1, int(len(text) * max_tokens / total))
+            truncated = text[:cut]
+            while (await self.model.count_tokens_async(truncated)).total_tokens > max_tokens:
+                cut = int(cut * 0.9)
+                truncated = text[:cut]
+
+            return truncated
+
+        except Exception as e:
+            logger.warning("Token-aware truncation failed, using character slice: %s", e)
+            return text[:max_tokens * 3]
+
     async def generate_summary(self, text: str, max_length: int = 300) -> str:
         """Generate a summary of the PDF content using Gemini"""
         try:
-            # Truncate text if too long
-            if len(text) > 15000:  # Gemini can handle longer texts than GPT
-                text = text[:15000] + "..."
-            
+            # Truncate by token count if the document could plausibly exceed
+            # the budget (short texts skip the tokenizer round-trip)
+            if len(text) > 6000:
+                truncated = await self._truncate_to_tokens(text, 12000)
+                if len(truncated) < len(text):
+                    text = truncated + "..."
+
+            # Return cached summary for previously-seen documents
+            cache_key = self._build_state_key('summary', f"max_length={max_length}", context=text)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
             prompt = f"""
             Please provide a concise summary of the following document. 
             Focus on the main topics, key points, and overall content structure.
@@ -81,14 +265,18 @@ class GeminiService:
             Summary:
             """
             
-            response = self.model.generate_content(
-                prompt,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
+            async for attempt in _api_retrying():
+                with attempt:
+                    response = await self.model.generate_content_async(
+                        prompt,
+                        generation_config=self.generation_config,
+                        safety_settings=self.safety_settings
+                    )
             
             if response.text:
-                return response.text.strip()
+                summary = response.text.strip()
+                self._cache_set(cache_key, summary)
+                return summary
             else:
                 return "Unable to generate summary due to content policy restrictions."
         
@@ -97,49 +285,256 @@ class GeminiService:
     
     async def generate_chat_response(
         self, 
-        message: str, 
-        context: str = "", 
+        message: str,
+        context: str = "",
         language: str = "en-US",
-        chat_history: List[ChatMessage] = []
+        chat_history: List[ChatMessage] = [],
+        session_id: Optional[str] = None
     ) -> str:
         """Generate AI response for chat with PDF using Gemini"""
         try:
-            # Build the complete prompt with context and history
-            full_prompt = self._build_chat_prompt(message, context, language, chat_history)
-            
-            response = self.model.generate_content(
-                full_prompt,
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
+            # Cap the document context by token count (see _truncate_to_tokens)
+            if context and len(context) > 2000:
+                truncated = await self._truncate_to_tokens(context, 2500)
+                if len(truncated) < len(context):
+                    context = truncated + "\n\n[Document truncated for length...]"
+
+            # Return cached answer for repeated questions against the same
+            # document. Session turns bypass the cache entirely: a cached
+            # answer would return before the ChatSession saw the turn,
+            # silently forking the server-side history from the client's
+            # conversation.
+            cache_key = None
+            if session_id is None:
+                cache_key = self._build_state_key('chat', message, context, language, chat_history)
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # With a session id, reuse a live ChatSession so only the new
+            # turn is serialized and sent - the SDK holds the history
+            if session_id:
+                response = await self._send_session_message(session_id, message, context, language, chat_history)
+                if response is not None and response.text:
+                    return response.text.strip()
+
+            # Prefer the native context-caching path for document chats:
+            # the PDF text lives server-side and only history + the new
+            # turn are sent per request
+            response = None
+            if context:
+                cached_model = await self._get_context_model(context, language)
+                if cached_model is not None:
+                    try:
+                        response = await cached_model.generate_content_async(
+                            self._build_chat_prompt_no_context(message, chat_history),
+                            generation_config=self.generation_config,
+                            safety_settings=self.safety_settings
+                        )
+                    except Exception as cache_error:
+                        # Handle likely expired server-side; drop it and re-send inline
+                        logger.warning("Cached-context generation failed, retrying inline: %s", cache_error)
+                        self._context_cache.pop(self._context_key(context), None)
+                        response = None
+
+            if response is None:
+                # Build the complete prompt with context and history
+                full_prompt = self._build_chat_prompt(message, context, language, chat_history)
+
+                async for attempt in _api_retrying():
+                    with attempt:
+                        response = await self.model.generate_content_async(
+                            full_prompt,
+                            generation_config=self.generation_config,
+                            safety_settings=self.safety_settings
+                        )
             
             if response.text:
-                return response.text.strip()
+                answer = response.text.strip()
+                if cache_key is not None:
+                    self._cache_set(cache_key, answer)
+                return answer
             else:
                 return "I apologize, but I couldn't generate a response due to content policy restrictions. Please try rephrasing your question."
         
         except Exception as e:
             raise ValueError(f"Error generating chat response with Gemini: {str(e)}")
     
-    def _build_chat_prompt(self, message: str, context: str, language: str, chat_history: List[ChatMessage]) -> str:
-        """Build complete prompt with context and chat history"""
+    async def generate_chat_response_stream(
+        self,
+        message: str,
+        context: str = "",
+        language: str = "en-US",
+        chat_history: List[ChatMessage] = []
+    ):
+        """Yield the chat response as text chunks while Gemini generates it.
+
+        Streaming lets callers start downstream work (voice synthesis, UI
+        rendering) on the first sentences before the full answer exists.
+        Cache hits are yielded as a single chunk, and a completed stream is
+        cached the same way as the non-streaming path.
+        """
+        # Cap the document context by token count (see _truncate_to_tokens)
+        if context and len(context) > 2000:
+            truncated = await self._truncate_to_tokens(context, 2500)
+            if len(truncated) < len(context):
+                context = truncated + "\n\n[Document truncated for length...]"
+
+        cache_key = self._build_state_key('chat', message, context, language, chat_history)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        full_prompt = self._build_chat_prompt(message, context, language, chat_history)
+        response = await self.model.generate_content_async(
+            full_prompt,
+            generation_config=self.generation_config,
+            safety_settings=self.safety_settings,
+            stream=True
+        )
+
+        parts = []
+        async for chunk in response:
+            # .text raises on chunks with no usable candidate (safety blocks)
+            try:
+                text = chunk.text
+            except Exception:
+                continue
+            if text:
+                parts.append(text)
+                yield text
+
+        if parts:
+            self._cache_set(cache_key, "".join(parts).strip())
+
+    async def batch_generate_chat_response(self, items: List[dict]) -> List:
+        """Generate responses for multiple independent chat requests in parallel.
+
+        Each item is a dict of generate_chat_response keyword arguments
+        (message, context, language, chat_history). Results keep the input
+        order; items that failed hold the exception instead of a response.
+        """
+        async def _one(item):
+            async with self._sem:
+                return await self.generate_chat_response(
+                    message=item.get("message", ""),
+                    context=item.get("context", ""),
+                    language=item.get("language", "en-US"),
+                    chat_history=item.get("chat_history", []),
+                    session_id=item.get("session_id")
+                )
+
+        return await asyncio.gather(*[_one(item) for item in items], return_exceptions=True)
+
+    async def _send_session_message(self, session_id: str, message: str, context: str,
+                                    language: str, chat_history: List[ChatMessage]):
+        """Send a turn through the cached ChatSession for this session, or None on failure"""
+        try:
+            chat = self._sessions.pop(session_id, None)
+            if chat is None:
+                if context:
+                    # Keep the document server-side too; without a cached
+                    # context handle a session would lose the document, so
+                    # let the caller use the stateless path instead
+                    base_model = await self._get_context_model(context, language)
+                    if base_model is None:
+                        return None
+                else:
+                    base_model = self.model
+
+                history = [
+                    {"role": "user" if m.role == "user" else "model", "parts": [m.content]}
+                    for m in chat_history
+                ]
+                chat = base_model.start_chat(history=history)
+
+            # Reinsert to refresh recency, then evict the coldest sessions
+            # once over the cap (dicts iterate in insertion order)
+            self._sessions[session_id] = chat
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.pop(next(iter(self._sessions)))
+
+            async for attempt in _api_retrying():
+                with attempt:
+                    return await chat.send_message_async(
+                        message,
+                        generation_config=self.generation_config,
+                        safety_settings=self.safety_settings
+                    )
+
+        except Exception as session_error:
+            # Drop the broken session and let the stateless path answer
+            logger.warning("Chat session failed, falling back to stateless prompt: %s", session_error)
+            self._sessions.pop(session_id, None)
+            return None
+
+    def _context_key(self, context: str) -> str:
+        """Short stable key for a document context"""
+        return hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+
+    async def _get_context_model(self, context: str, language: str):
+        """Get a model bound to a server-side cache of this document, creating it on first use.
+
+        Creation uploads the whole document through a synchronous SDK call,
+        so it runs in a thread instead of freezing the event loop; concurrent
+        first turns on the same document coalesce onto one upload.
+        """
+        key = self._context_key(context)
+
+        if key not in self._context_cache:
+            fut = self._context_creates.get(key)
+            if fut is not None:
+                await fut
+            else:
+                fut = asyncio.get_running_loop().create_future()
+                self._context_creates[key] = fut
+                try:
+                    try:
+                        handle = await asyncio.to_thread(
+                            genai.caching.CachedContent.create,
+                            model=self.model_name,
+                            contents=[context],
+                            system_instruction=self._build_context_system_instruction(language),
+                            ttl=timedelta(hours=1)
+                        )
+                    except Exception as e:
+                        # Context caching can be unsupported for the model or
+                        # rejected for small documents - remember the failure
+                        # and use the inline-context path for this document
+                        logger.info("Gemini context caching unavailable, using inline context: %s", e)
+                        handle = None
+                    self._context_cache[key] = handle
+                    fut.set_result(handle)
+                except BaseException as e:
+                    # Propagate cancellation to coalesced waiters instead of
+                    # leaving them parked on an unresolved future
+                    if not fut.done():
+                        fut.set_exception(e)
+                        fut.exception()
+                    raise
+                finally:
+                    self._context_creates.pop(key, None)
+
+        handle = self._context_cache.get(key)
+        if handle is None:
+            return None
+
+        try:
+            return genai.GenerativeModel.from_cached_content(cached_content=handle)
+        except Exception as e:
+            logger.warning("Failed to use cached context, using inline context: %s", e)
+            self._context_cache[key] = None
+            return None
+
+    def _build_context_system_instruction(self, language: str) -> str:
+        """System instruction stored alongside the cached document content"""
         language_instruction = self._get_language_instruction(language)
-        
-        prompt_parts = []
-        
-        # System instruction
-        if context:
-            # Truncate context if too long
-            if len(context) > 10000:
-                context = context[:10000] + "\n\n[Document truncated for length...]"
-            
-            prompt_parts.append(f"""
-You are an AI assistant helping users understand and discuss a document.
-{language_instruction}
 
-Here is the document content for reference:
+        return f"""You are an AI assistant helping users understand and discuss a document.
+{language_instruction}
 
-{context}
+The document content is provided as cached context.
 
 Instructions:
 - Answer questions based on the document content when possible
@@ -152,66 +547,81 @@ Instructions:
 - Use bullet points with - when listing items
 - Highlight numbers and percentages for better readability
 - Structure longer responses with clear sections
-""")
-        else:
-            prompt_parts.append(f"""
-You are a helpful AI assistant.
-{language_instruction}
+"""
+
+    def _build_chat_prompt_no_context(self, message: str, chat_history: List[ChatMessage]) -> str:
+        """Build the per-turn prompt for the cached-context path (history + new message only)"""
+        prompt_parts = []
 
-Instructions:
-- Provide helpful and accurate responses
-- Be conversational and friendly
-- If you don't know something, admit it honestly
-- Format your responses clearly with proper paragraphs
-- Use **bold** for important terms and *italics* for emphasis
-- Use bullet points with - when listing items
-- Highlight key numbers and information
-- Structure longer responses with clear sections
-""")
-        
-        # Add chat history
         if chat_history:
-            prompt_parts.append("\nPrevious conversation:")
+            prompt_parts.append("Previous conversation:")
             for msg in chat_history[-10:]:  # Keep last 10 messages
                 role = "Human" if msg.role == "user" else "Assistant"
                 prompt_parts.append(f"{role}: {msg.content}")
-        
-        # Add current message
+
         prompt_parts.append(f"\nHuman: {message}")
         prompt_parts.append("Assistant:")
-        
+
         return "\n".join(prompt_parts)
+
+    def _build_chat_prompt(self, message: str, context: str, language: str, chat_history: List[ChatMessage]) -> str:
+        """Build complete prompt with context and chat history"""
+        language_instruction = self._get_language_instruction(language)
+
+        prompt = io.StringIO()
+
+        # System instruction, rendered from the precompiled templates;
+        # context is already token-truncated by the caller
+        if context:
+            prompt.write(_CONTEXT_PROMPT_TEMPLATE.render(
+                language_instruction=language_instruction,
+                context=context
+            ))
+        else:
+            prompt.write(_NO_CONTEXT_PROMPT_TEMPLATE.render(
+                language_instruction=language_instruction
+            ))
+
+        # Add chat history
+        if chat_history:
+            prompt.write("\n\nPrevious conversation:")
+            for msg in chat_history[-10:]:  # Keep last 10 messages
+                role = "Human" if msg.role == "user" else "Assistant"
+                prompt.write(f"\n{role}: {msg.content}")
+
+        # Add current message
+        prompt.write(f"\n\nHuman: {message}")
+        prompt.write("\nAssistant:")
+
+        return prompt.getvalue()
     
-    def _get_language_instruction(self, language: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _get_language_instruction(language: str) -> str:
         """Get language-specific instructions for Gemini"""
-        language_map = {
-            'en-US': 'Please respond in English.',
-            'es-ES': 'Por favor responde en español.',
-            'fr-FR': 'Veuillez répondre en français.',
-            'de-DE': 'Bitte antworten Sie auf Deutsch.',
-            'it-IT': 'Si prega di rispondere in italiano.',
-            'pt-BR': 'Por favor, responda em português.',
-            'ru-RU': 'Пожалуйста, отвечайте на русском языке.',
-            'ja-JP': '日本語で回答してください。',
-            'ko-KR': '한국어로 답변해 주세요.',
-            'zh-CN': '请用中文回答。',
-            'ar-SA': 'يرجى الرد باللغة العربية.',
-            'hi-IN': 'कृपया हिंदी में उत्तर दें।'
-        }
-        
-        return language_map.get(language, 'Please respond in English.')
+        return _LANG_INSTRUCTIONS.get(language, _LANG_INSTRUCTIONS['en-US'])
     
-    async def test_connection(self) -> bool:
-        """Test if Gemini API is working"""
+    async def test_connection(self, include_generation: bool = False) -> bool:
+        """Test if Gemini API is working.
+
+        Uses count_tokens by default - it answers the same reachability/auth
+        question as a full generation but costs no output tokens and returns
+        in a fraction of the time, so health probes can run frequently.
+        Pass include_generation=True to verify actual text generation.
+        """
         try:
-            response = self.model.generate_content(
-                "Hello, this is a test message. Please respond with 'Hello, Gemini is working!'",
-                generation_config=self.generation_config,
-                safety_settings=self.safety_settings
-            )
-            return bool(response.text and "working" in response.text.lower())
+            if include_generation:
+                response = await self.model.generate_content_async(
+                    "Hello, this is a test message. Please respond with 'Hello, Gemini is working!'",
+                    generation_config=self.generation_config,
+                    safety_settings=self.safety_settings
+                )
+                return bool(response.text and "working" in response.text.lower())
+
+            result = await self.model.count_tokens_async("ping")
+            return result.total_tokens > 0
         except Exception as e:
-            print(f"Gemini connection test failed: {e}")
+            logger.warning("Gemini connection test failed: %s", e)
             return False
     
     async def get_model_info(self) -> dict:
@@ -1,14 +1,273 @@
 import os
+import base64
+import logging
+import hashlib
 import httpx
 import aiofiles
 from typing import Optional, List, Dict
-import uuid
+import time
 import asyncio
+from dataclasses import dataclass
 from datetime import datetime
 from murf import Murf
+from tenacity import AsyncRetrying, stop_after_attempt, wait_exponential_jitter, retry_if_exception_type
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class SynthResult:
+    """Synthesized audio: local path plus the public URL it is served at"""
+    path: str
+    filename: str
+    url: str
+
+    @classmethod
+    def from_path(cls, path: str) -> "SynthResult":
+        filename = os.path.basename(path)
+        return cls(path=path, filename=filename, url=f"/audio/{filename}")
+
+def _download_retrying() -> AsyncRetrying:
+    """Retry policy for transient failures while fetching Murf audio"""
+    return AsyncRetrying(
+        stop=stop_after_attempt(4),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception_type((httpx.TransportError, httpx.TimeoutException)),
+        reraise=True
+    )
+
+# Default voice catalog, frozen at import so per-call lookups never
+# rebuild the list of dicts
+_DEFAULT_VOICES = tuple([
+    # English (US) Voices - Using confirmed working IDs
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia",
+        "language": "en-US",
+        "gender": "female",
+        "accent": "American",
+        "style": "Conversational",
+        "specialty": "Professional & Warm",
+        "description": "Ideal for business presentations, e-learning, and customer service"
+    },
+    {
+        "voice_id": "en-US-adam",
+        "name": "Adam",
+        "language": "en-US",
+        "gender": "male",
+        "accent": "American",
+        "style": "Professional",
+        "specialty": "Corporate & Leadership",
+        "description": "Perfect for corporate communications and executive presentations"
+    },
+    {
+        "voice_id": "en-US-sarah",
+        "name": "Sarah",
+        "language": "en-US",
+        "gender": "female",
+        "accent": "American",
+        "style": "Friendly",
+        "specialty": "Customer Service",
+        "description": "Warm and approachable for customer interactions"
+    },
+    
+    # English (UK) Voices
+    {
+        "voice_id": "en-GB-olivia",
+        "name": "Olivia",
+        "language": "en-GB",
+        "gender": "female",
+        "accent": "British",
+        "style": "Elegant",
+        "specialty": "Luxury & Premium",
+        "description": "Sophisticated British accent for luxury brands"
+    },
+    {
+        "voice_id": "en-GB-william",
+        "name": "William",
+        "language": "en-GB",
+        "gender": "male",
+        "accent": "British",
+        "style": "Distinguished",
+        "specialty": "Education & Literature",
+        "description": "Classic British voice for educational content"
+    },
+    
+    # For other languages, use English voice as fallback until we confirm working IDs
+    # Spanish
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "es-ES",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Spanish language support"
+    },
+    
+    # French
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "fr-FR",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with French language support"
+    },
+    
+    # German
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "de-DE",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with German language support"
+    },
+    
+    # Italian
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "it-IT",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Italian language support"
+    },
+    
+    # Portuguese
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "pt-BR",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Portuguese language support"
+    },
+    
+    # Japanese
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "ja-JP",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Japanese language support"
+    },
+    
+    # Korean
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "ko-KR",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Korean language support"
+    },
+    
+    # Chinese
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "zh-CN",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Chinese language support"
+    },
+    
+    # Hindi
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "hi-IN",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Hindi language support"
+    },
+    
+    # Arabic
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "ar-SA",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Arabic language support"
+    },
+    
+    # Dutch
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "nl-NL",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Dutch language support"
+    },
+    
+    # Russian
+    {
+        "voice_id": "en-US-julia",
+        "name": "Julia (English Fallback)",
+        "language": "ru-RU",
+        "gender": "female",
+        "accent": "American English",
+        "style": "Professional",
+        "specialty": "Multilingual Support",
+        "description": "Professional English voice with Russian language support"
+    }
+])
+
+# First voice per full language code and per language prefix ("en", "es", ...)
+_VOICES_BY_LANG = {}
+_VOICE_BY_LANG_PREFIX = {}
+for _voice in _DEFAULT_VOICES:
+    _VOICES_BY_LANG.setdefault(_voice["language"], _voice)
+    _VOICE_BY_LANG_PREFIX.setdefault(_voice["language"].split("-")[0], _voice)
+
+_DEFAULT_FALLBACK_VOICE = _VOICES_BY_LANG["en-US"]
+
+# Recommended voice settings per language, frozen at module scope
+_VOICE_SETTINGS_BY_LANG = {
+    "en-US": {"speed": 1.0, "emotion": "neutral"},
+    "en-GB": {"speed": 0.9, "emotion": "neutral"},
+    "es-ES": {"speed": 0.95, "emotion": "warm"},
+    "es-MX": {"speed": 1.0, "emotion": "warm"},
+    "fr-FR": {"speed": 0.9, "emotion": "elegant"},
+    "de-DE": {"speed": 0.9, "emotion": "professional"},
+    "it-IT": {"speed": 1.0, "emotion": "expressive"},
+    "pt-BR": {"speed": 1.0, "emotion": "warm"},
+    "ja-JP": {"speed": 0.95, "emotion": "polite"},
+    "ko-KR": {"speed": 0.95, "emotion": "gentle"},
+    "zh-CN": {"speed": 0.9, "emotion": "clear"},
+    "hi-IN": {"speed": 0.95, "emotion": "friendly"},
+    "ar-SA": {"speed": 0.9, "emotion": "formal"}
+}
+
+_DEFAULT_VOICE_SETTINGS = {"speed": 1.0, "emotion": "neutral"}
 
 class MurfService:
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
         self.api_key = os.getenv("MURF_API_KEY")
         self.audio_dir = os.getenv("AUDIO_DIR", "../audio_files")
         self.default_voice = os.getenv("DEFAULT_VOICE_ID", "en-US-julia")
@@ -22,6 +281,37 @@ class MurfService:
             self.client = Murf(api_key=self.api_key)
         else:
             self.client = None
+
+        # Shared HTTP client for audio downloads: keep-alive connections
+        # avoid a fresh TCP+TLS handshake per TTS call. A caller-provided
+        # client is reused (one pool across services) and stays the
+        # caller's to close.
+        if http_client is not None:
+            self._http = http_client
+            self._owns_http = False
+        else:
+            self._http = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                timeout=30.0
+            )
+            self._owns_http = True
+
+        # TTL cache for the SDK voice catalog - the voice list changes rarely
+        # but was fetched on every request. The lock coalesces concurrent
+        # refreshes so at most one voices.list() call is in flight per expiry.
+        self._voices_cache: Optional[tuple] = None  # (fetched_at, voices)
+        self._voices_ttl = int(os.getenv("MURF_VOICES_TTL", 300))
+        self._voices_lock = asyncio.Lock()
+
+        # Dedup cache for synthesized audio: same (voice, language, speed,
+        # text) returns the already-downloaded file instead of re-calling Murf
+        self._tts_cache: Dict[str, str] = {}
+
+    async def close(self):
+        """Close the pooled HTTP client, if this service owns it"""
+        if self._owns_http:
+            await self._http.aclose()
     
     async def text_to_speech(
         self, 
@@ -30,7 +320,7 @@ class MurfService:
         language: str = "en-US",
         speed: float = None,
         emotion: str = None
-    ) -> str:
+    ) -> SynthResult:
         """Convert text to speech using Murf SDK"""
         try:
             if not self.client:
@@ -44,85 +334,199 @@ class MurfService:
             max_chars = 2900  # Leave some buffer
             if len(text) > max_chars:
                 text = text[:max_chars] + "..."
-                print(f"Text truncated to {max_chars} characters for Murf API")
-            
-            print(f"Using Murf SDK to generate speech with voice: {voice_id}, text length: {len(text)}")
+                logger.debug("Text truncated to %d characters for Murf API", max_chars)
             
-            # Use asyncio to run the synchronous Murf SDK call
-            def generate_speech():
-                return self.client.text_to_speech.generate(
-                    text=text,
-                    voice_id=voice_id,
-                    format="MP3",
-                    channel_type="STEREO",
-                    sample_rate=44100  # Use valid sample rate
-                )
-            
-            # Run in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, generate_speech)
+            # Deduplicate repeated requests: identical (voice, language,
+            # speed, text) resolves to the same deterministic filename, so
+            # replays skip the Murf round-trip entirely
+            cache_key = hashlib.blake2b(
+                f"{voice_id}|{language}|{speed}|{text}".encode('utf-8'), digest_size=16
+            ).hexdigest()
+            cached_path = self._tts_cache.get(cache_key)
+            if cached_path and os.path.exists(cached_path):
+                logger.debug("TTS cache hit for voice %s, reusing %s", voice_id, cached_path)
+                return SynthResult.from_path(cached_path)
+
+            # The filename is derived from the request, so a file generated
+            # before a restart can be reused without re-calling Murf
+            audio_path = os.path.join(self.audio_dir, f"murf_{cache_key}.mp3")
+            if os.path.exists(audio_path):
+                logger.debug("TTS disk hit for voice %s, reusing %s", voice_id, audio_path)
+                self._tts_cache[cache_key] = audio_path
+                return SynthResult.from_path(audio_path)
+
+            logger.debug("Using Murf SDK to generate speech with voice: %s, text length: %d", voice_id, len(text))
+
+            # Run the synchronous Murf SDK call in a thread to avoid blocking
+            response = await asyncio.to_thread(
+                self.client.text_to_speech.generate,
+                text=text,
+                voice_id=voice_id,
+                format="MP3",
+                channel_type="STEREO",
+                sample_rate=44100  # Use valid sample rate
+            )
             
-            print(f"Murf SDK response type: {type(response)}")
-            print(f"Murf SDK response audio_file: {response.audio_file}")
+            logger.debug("Murf SDK response type: %s", type(response))
+            logger.debug("Murf SDK response audio_file: %s", response.audio_file)
             
             # The SDK returns an audio_file URL that we need to download
             if hasattr(response, 'audio_file') and response.audio_file:
-                # Download the audio file from the URL
-                import httpx
-                async with httpx.AsyncClient() as client:
-                    audio_response = await client.get(response.audio_file)
-                    if audio_response.status_code == 200:
-                        # Save the audio data to file
-                        audio_filename = f"murf_{uuid.uuid4()}.mp3"
-                        audio_path = os.path.join(self.audio_dir, audio_filename)
-                        
-                        async with aiofiles.open(audio_path, 'wb') as f:
-                            await f.write(audio_response.content)
-                        
-                        print(f"Murf audio downloaded and saved to: {audio_path}")
-                        return audio_path
-                    else:
-                        raise Exception(f"Failed to download audio from Murf: HTTP {audio_response.status_code}")
-                        
+                # Stream the audio straight to disk over the pooled client,
+                # so only one chunk at a time is held in memory
+                audio_filename = f"murf_{cache_key}.mp3"
+                audio_path = os.path.join(self.audio_dir, audio_filename)
+
+                # Each retry attempt reopens the file in 'wb' mode, so a
+                # partially written download is never kept
+                async for attempt in _download_retrying():
+                    with attempt:
+                        async with self._http.stream("GET", response.audio_file) as audio_response:
+                            if audio_response.status_code != 200:
+                                raise Exception(f"Failed to download audio from Murf: HTTP {audio_response.status_code}")
+
+                            async with aiofiles.open(audio_path, 'wb') as f:
+                                async for chunk in audio_response.aiter_bytes(65536):
+                                    await f.write(chunk)
+
+                logger.debug("Murf audio downloaded and saved to: %s", audio_path)
+                self._tts_cache[cache_key] = audio_path
+                return SynthResult.from_path(audio_path)
+
+
             elif hasattr(response, 'encoded_audio') and response.encoded_audio:
-                # Handle base64 encoded audio
-                import base64
-                audio_data = base64.b64decode(response.encoded_audio)
-                
-                audio_filename = f"murf_{uuid.uuid4()}.mp3"
+                # Handle base64 encoded audio, decoding in windows instead of
+                # materializing the full decoded payload up front
+                encoded = response.encoded_audio
+
+                audio_filename = f"murf_{cache_key}.mp3"
                 audio_path = os.path.join(self.audio_dir, audio_filename)
-                
+
                 async with aiofiles.open(audio_path, 'wb') as f:
-                    await f.write(audio_data)
-                
-                print(f"Murf audio (base64) saved to: {audio_path}")
-                return audio_path
+                    for i in range(0, len(encoded), 8192):  # multiple of 4 keeps base64 alignment
+                        await f.write(base64.b64decode(encoded[i:i + 8192]))
+
+                logger.debug("Murf audio (base64) saved to: %s", audio_path)
+                self._tts_cache[cache_key] = audio_path
+                return SynthResult.from_path(audio_path)
                 
             else:
-                print(f"No audio data in Murf SDK response. Available attributes: {dir(response)}")
+                logger.error("No audio data in Murf SDK response. Available attributes: %s", dir(response))
                 raise Exception(f"Invalid Murf SDK response - no audio data found")
         
         except Exception as e:
-            print(f"Murf SDK error: {str(e)}")
+            logger.error("Murf SDK error: %s", e)
             raise Exception(f"Murf SDK error: {str(e)}")
     
+    async def text_to_speech_stream(
+        self,
+        text: str,
+        voice_id: str = None,
+        language: str = "en-US",
+        speed: float = None
+    ):
+        """Yield synthesized MP3 bytes as they arrive from Murf.
+
+        The caller gets the first audio byte as soon as Murf starts
+        responding instead of after the full download; the stream is teed
+        to the regular cache file, renamed into place at EOF so a broken
+        stream never leaves a partial entry. Cache hits stream off disk.
+        """
+        if not self.client:
+            raise Exception("Murf API key not configured properly. Please set MURF_API_KEY environment variable.")
+
+        voice_id = voice_id or self.default_voice
+        speed = speed or self.default_speed
+
+        max_chars = 2900
+        if len(text) > max_chars:
+            text = text[:max_chars] + "..."
+
+        cache_key = hashlib.blake2b(
+            f"{voice_id}|{language}|{speed}|{text}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+        audio_path = os.path.join(self.audio_dir, f"murf_{cache_key}.mp3")
+
+        if os.path.exists(audio_path):
+            self._tts_cache[cache_key] = audio_path
+            async with aiofiles.open(audio_path, 'rb') as f:
+                while chunk := await f.read(65536):
+                    yield chunk
+            return
+
+        response = await asyncio.to_thread(
+            self.client.text_to_speech.generate,
+            text=text,
+            voice_id=voice_id,
+            format="MP3",
+            channel_type="STEREO",
+            sample_rate=44100
+        )
+
+        tmp_path = f"{audio_path}.part"
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                if getattr(response, 'audio_file', None):
+                    async with self._http.stream("GET", response.audio_file) as audio_response:
+                        if audio_response.status_code != 200:
+                            raise Exception(f"Failed to download audio from Murf: HTTP {audio_response.status_code}")
+                        async for chunk in audio_response.aiter_bytes(65536):
+                            await f.write(chunk)
+                            yield chunk
+
+                elif getattr(response, 'encoded_audio', None):
+                    encoded = response.encoded_audio
+                    for i in range(0, len(encoded), 8192):  # multiple of 4 keeps base64 alignment
+                        chunk = base64.b64decode(encoded[i:i + 8192])
+                        await f.write(chunk)
+                        yield chunk
+
+                else:
+                    raise Exception("Invalid Murf SDK response - no audio data found")
+
+            os.replace(tmp_path, audio_path)
+            self._tts_cache[cache_key] = audio_path
+
+        except BaseException:
+            # Covers errors and client disconnects (GeneratorExit) alike -
+            # a partial file must never become a cache entry
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
     async def get_available_voices(self) -> List[Dict]:
         """Get list of available voices from Murf SDK"""
         try:
             if not self.client:
                 return self._get_default_voices()
-            
-            print("Fetching voices from Murf SDK...")
-            
+
+            # Serve from the TTL cache when fresh
+            if self._voices_cache and time.monotonic() - self._voices_cache[0] < self._voices_ttl:
+                return self._voices_cache[1]
+
+            async with self._voices_lock:
+                # Double-check after acquiring the lock - another caller may
+                # have refreshed the cache while we waited
+                if self._voices_cache and time.monotonic() - self._voices_cache[0] < self._voices_ttl:
+                    return self._voices_cache[1]
+
+                return await self._fetch_voices()
+
+        except Exception as e:
+            logger.warning("Error fetching Murf voices from SDK: %s", e)
+            return self._get_default_voices()
+
+    async def _fetch_voices(self) -> List[Dict]:
+        """Fetch and cache the voice catalog from the Murf SDK"""
+        try:
+            logger.debug("Fetching voices from Murf SDK...")
+
             # Try to get real voices from Murf API
             try:
-                # Use the SDK to get actual voices
-                def get_voices():
-                    return self.client.voices.list()
-                
-                # Run in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                voices_response = await loop.run_in_executor(None, get_voices)
+                # Run the SDK call in a thread to avoid blocking
+                voices_response = await asyncio.to_thread(self.client.voices.list)
                 
                 if hasattr(voices_response, 'voices') and voices_response.voices:
                     processed_voices = []
@@ -136,298 +540,75 @@ class MurfService:
                             "style": voice.style if hasattr(voice, 'style') else str(voice.get('style', '')),
                             "description": f"{voice.name} - {voice.language}" if hasattr(voice, 'name') else 'Murf Voice'
                         })
-                    print(f"Successfully fetched {len(processed_voices)} voices from Murf API")
+                    logger.info("Successfully fetched %d voices from Murf API", len(processed_voices))
+                    self._voices_cache = (time.monotonic(), processed_voices)
                     return processed_voices
                 else:
-                    print("No voices returned from Murf API, using defaults")
+                    logger.info("No voices returned from Murf API, using defaults")
                     return self._get_default_voices()
                     
             except Exception as sdk_error:
-                print(f"Murf SDK voices.list() error: {str(sdk_error)}")
+                logger.warning("Murf SDK voices.list() error: %s", sdk_error)
                 return self._get_default_voices()
         
         except Exception as e:
-            print(f"Error fetching Murf voices from SDK: {str(e)}")
+            logger.warning("Error fetching Murf voices from SDK: %s", e)
             return self._get_default_voices()
     
     def _get_default_voices(self) -> List[Dict]:
-        """Return verified Murf voice catalog with actual working voice IDs"""
-        return [
-            # English (US) Voices - Using confirmed working IDs
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia",
-                "language": "en-US",
-                "gender": "female",
-                "accent": "American",
-                "style": "Conversational",
-                "specialty": "Professional & Warm",
-                "description": "Ideal for business presentations, e-learning, and customer service"
-            },
-            {
-                "voice_id": "en-US-adam",
-                "name": "Adam",
-                "language": "en-US",
-                "gender": "male",
-                "accent": "American",
-                "style": "Professional",
-                "specialty": "Corporate & Leadership",
-                "description": "Perfect for corporate communications and executive presentations"
-            },
-            {
-                "voice_id": "en-US-sarah",
-                "name": "Sarah",
-                "language": "en-US",
-                "gender": "female",
-                "accent": "American",
-                "style": "Friendly",
-                "specialty": "Customer Service",
-                "description": "Warm and approachable for customer interactions"
-            },
-            
-            # English (UK) Voices
-            {
-                "voice_id": "en-GB-olivia",
-                "name": "Olivia",
-                "language": "en-GB",
-                "gender": "female",
-                "accent": "British",
-                "style": "Elegant",
-                "specialty": "Luxury & Premium",
-                "description": "Sophisticated British accent for luxury brands"
-            },
-            {
-                "voice_id": "en-GB-william",
-                "name": "William",
-                "language": "en-GB",
-                "gender": "male",
-                "accent": "British",
-                "style": "Distinguished",
-                "specialty": "Education & Literature",
-                "description": "Classic British voice for educational content"
-            },
-            
-            # For other languages, use English voice as fallback until we confirm working IDs
-            # Spanish
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "es-ES",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Spanish language support"
-            },
-            
-            # French
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "fr-FR",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with French language support"
-            },
-            
-            # German
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "de-DE",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with German language support"
-            },
-            
-            # Italian
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "it-IT",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Italian language support"
-            },
-            
-            # Portuguese
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "pt-BR",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Portuguese language support"
-            },
-            
-            # Japanese
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "ja-JP",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Japanese language support"
-            },
-            
-            # Korean
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "ko-KR",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Korean language support"
-            },
-            
-            # Chinese
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "zh-CN",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Chinese language support"
-            },
-            
-            # Hindi
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "hi-IN",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Hindi language support"
-            },
-            
-            # Arabic
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "ar-SA",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Arabic language support"
-            },
-            
-            # Dutch
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "nl-NL",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Dutch language support"
-            },
-            
-            # Russian
-            {
-                "voice_id": "en-US-julia",
-                "name": "Julia (English Fallback)",
-                "language": "ru-RU",
-                "gender": "female",
-                "accent": "American English",
-                "style": "Professional",
-                "specialty": "Multilingual Support",
-                "description": "Professional English voice with Russian language support"
-            }
-        ]
+        """Return the verified Murf voice catalog, frozen at import time"""
+        return _DEFAULT_VOICES
     
     async def get_voice_by_language(self, language: str) -> Dict:
-        """Get a suitable voice for a specific language"""
-        voices = await self.get_available_voices()
-        
-        # Find voices for the specified language
-        matching_voices = [v for v in voices if v.get("language", "").startswith(language.split("-")[0])]
-        
-        if matching_voices:
-            return matching_voices[0]  # Return first matching voice
-        else:
-            # Return default English voice as fallback
-            return {
-                "voice_id": "en-US-julia",
-                "name": "Julia",
-                "language": "en-US",
-                "gender": "female"
-            }
+        """Get a suitable voice for a specific language via the prebuilt prefix index"""
+        prefix = language.split("-", 1)[0]
+        return _VOICE_BY_LANG_PREFIX.get(prefix, _DEFAULT_FALLBACK_VOICE)
     
-    async def batch_text_to_speech(self, text_items: List[Dict]) -> List[str]:
-        """Convert multiple text items to speech"""
-        audio_files = []
-        
-        for item in text_items:
-            try:
-                audio_path = await self.text_to_speech(
-                    text=item.get("text", ""),
-                    voice_id=item.get("voice_id"),
-                    language=item.get("language", "en-US"),
-                    speed=item.get("speed", 1.0)
-                )
-                audio_files.append(audio_path)
-            except Exception as e:
-                print(f"Error processing batch item: {e}")
-                audio_files.append(None)
-        
-        return audio_files
+    async def batch_text_to_speech(self, text_items: List[Dict]) -> List[Optional[SynthResult]]:
+        """Convert multiple text items to speech in parallel"""
+        sem = asyncio.Semaphore(int(os.getenv("MURF_CONCURRENCY", 8)))
+
+        async def _one(item):
+            async with sem:
+                try:
+                    return await self.text_to_speech(
+                        text=item.get("text", ""),
+                        voice_id=item.get("voice_id"),
+                        language=item.get("language", "en-US"),
+                        speed=item.get("speed", 1.0)
+                    )
+                except Exception as e:
+                    logger.warning("Error processing batch item: %s", e)
+                    return None
+
+        return await asyncio.gather(*[_one(item) for item in text_items])
     
     def get_voice_settings_for_language(self, language: str) -> Dict:
         """Get recommended voice settings for a language"""
-        settings = {
-            "en-US": {"speed": 1.0, "emotion": "neutral"},
-            "en-GB": {"speed": 0.9, "emotion": "neutral"},
-            "es-ES": {"speed": 0.95, "emotion": "warm"},
-            "es-MX": {"speed": 1.0, "emotion": "warm"},
-            "fr-FR": {"speed": 0.9, "emotion": "elegant"},
-            "de-DE": {"speed": 0.9, "emotion": "professional"},
-            "it-IT": {"speed": 1.0, "emotion": "expressive"},
-            "pt-BR": {"speed": 1.0, "emotion": "warm"},
-            "ja-JP": {"speed": 0.95, "emotion": "polite"},
-            "ko-KR": {"speed": 0.95, "emotion": "gentle"},
-            "zh-CN": {"speed": 0.9, "emotion": "clear"},
-            "hi-IN": {"speed": 0.95, "emotion": "friendly"},
-            "ar-SA": {"speed": 0.9, "emotion": "formal"}
-        }
-        
-        return settings.get(language, {"speed": 1.0, "emotion": "neutral"})
+        return _VOICE_SETTINGS_BY_LANG.get(language, _DEFAULT_VOICE_SETTINGS)
     
+    def _cleanup_sync(self, cutoff: float):
+        """Remove audio files older than the cutoff timestamp (blocking)"""
+        with os.scandir(self.audio_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+
+                # scandir caches stat results, so this is one syscall per
+                # entry instead of listdir + getmtime's two
+                if entry.stat().st_mtime < cutoff:
+                    try:
+                        os.unlink(entry.path)
+                        logger.debug("Cleaned up old audio file: %s", entry.name)
+                    except FileNotFoundError:
+                        pass
+                    except Exception as e:
+                        logger.warning("Error removing file %s: %s", entry.name, e)
+
     async def cleanup_old_audio_files(self, max_age_hours: int = 2):
         """Clean up old audio files to save disk space"""
-        current_time = datetime.now()
-        
         try:
-            for filename in os.listdir(self.audio_dir):
-                file_path = os.path.join(self.audio_dir, filename)
-                
-                # Check file age
-                file_modified = datetime.fromtimestamp(os.path.getmtime(file_path))
-                age = current_time - file_modified
-                
-                if age.total_seconds() > (max_age_hours * 3600):
-                    try:
-                        os.remove(file_path)
-                        print(f"Cleaned up old audio file: {filename}")
-                    except Exception as e:
-                        print(f"Error removing file {filename}: {e}")
-        
+            cutoff = time.time() - max_age_hours * 3600
+            await asyncio.to_thread(self._cleanup_sync, cutoff)
         except Exception as e:
-            print(f"Error during audio cleanup: {e}")
+            logger.warning("Error during audio cleanup: %s", e)
@@ -1,46 +1,463 @@
 import os
+import json
+import time
+import asyncio
+import functools
+import hashlib
+import logging
+import httpx
 import openai
+from tenacity import AsyncRetrying, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+from dataclasses import dataclass
 from typing import List, Optional
 from datetime import datetime
 from app.models.chat_models import ChatMessage
 
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Language maps frozen at module scope so the hot path doesn't rebuild the
+# same dict literal per call
+_LANG_INSTRUCTIONS = {
+    "en-US": "Respond in clear, natural English.",
+    "en-GB": "Respond in British English.",
+    "es-ES": "Responde en español claro y natural.",
+    "es-MX": "Responde en español mexicano claro y natural.",
+    "fr-FR": "Répondez en français clair et naturel.",
+    "de-DE": "Antworten Sie in klarem, natürlichem Deutsch.",
+    "it-IT": "Rispondi in italiano chiaro e naturale.",
+    "pt-BR": "Responda em português brasileiro claro e natural.",
+    "ja-JP": "自然で明確な日本語で答えてください。",
+    "ko-KR": "명확하고 자연스러운 한국어로 답변해주세요.",
+    "zh-CN": "请用清晰、自然的中文回答。",
+    "hi-IN": "स्पष्ट और प्राकृतिक हिंदी में जवाब दें।",
+    "ar-SA": "أجب باللغة العربية الواضحة والطبيعية."
+}
+
+_TRANSLATE_LANG_NAMES = {
+    "es-ES": "Spanish",
+    "fr-FR": "French",
+    "de-DE": "German",
+    "it-IT": "Italian",
+    "pt-BR": "Portuguese",
+    "ja-JP": "Japanese",
+    "ko-KR": "Korean",
+    "zh-CN": "Chinese",
+    "hi-IN": "Hindi",
+    "ar-SA": "Arabic"
+}
+
+# Prompt scaffolding as constants - the instruction blocks are static text
+# that used to be re-interpolated through multi-line f-strings per request
+_ANALYZE_PROMPT_TMPL = """
+            Analyze the following document and return a JSON object with exactly these keys:
+            - "summary": a concise summary under {max_length} words covering the main topics, key points, and overall content structure
+            - "topics": a list of 5-10 key topics, each a brief phrase or keyword
+            - "questions": a list of 5 thoughtful questions readers might want to ask, varied in type (factual, analytical, clarifying)
+
+            Document content:
+            {text}
+            """
+
+_CONTEXT_SYSTEM_TMPL = """
+            You are an AI assistant helping users understand and discuss a document.
+            {language_instruction}
+
+            Here is the document content for reference:
+
+            {context}
+
+            Instructions:
+            - Answer questions based on the document content when possible
+            - If information isn't in the document, clearly state that
+            - Be helpful, accurate, and conversational
+            - Provide specific references to document sections when relevant
+            - If asked about topics not in the document, provide general helpful information but note it's not from the document
+            """
+
+_NO_CONTEXT_SYSTEM_TMPL = """
+            You are a helpful AI assistant.
+            {language_instruction}
+
+            Instructions:
+            - Provide helpful and accurate responses
+            - Be conversational and friendly
+            - If you don't know something, admit it honestly
+            """
+
+@dataclass(frozen=True)
+class _OpenAIConfig:
+    """Env-derived settings, read once per process instead of per construction"""
+    model: str
+    max_tokens: int
+    temperature: float
+    context_window: int
+    cache_ttl: int
+    breaker_fail_max: int
+    breaker_reset_seconds: float
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> _OpenAIConfig:
+    return _OpenAIConfig(
+        model=os.getenv("GPT_MODEL", "gpt-3.5-turbo"),
+        max_tokens=int(os.getenv("MAX_TOKENS", 1000)),
+        temperature=float(os.getenv("TEMPERATURE", 0.7)),
+        context_window=int(os.getenv("MODEL_CONTEXT_WINDOW", 16385)),
+        cache_ttl=int(os.getenv("OPENAI_CACHE_TTL", 86400)),
+        breaker_fail_max=int(os.getenv("OPENAI_BREAKER_FAILURES", 10)),
+        breaker_reset_seconds=float(os.getenv("OPENAI_BREAKER_RESET", 60))
+    )
+
+def _api_retrying() -> AsyncRetrying:
+    """Retry policy for transient OpenAI failures (429s, connection drops, 5xx)"""
+    return AsyncRetrying(
+        stop=stop_after_attempt(5),
+        wait=wait_random_exponential(min=1, max=30),
+        retry=retry_if_exception_type((
+            openai.RateLimitError,
+            openai.APIConnectionError,
+            openai.APITimeoutError,
+            openai.InternalServerError
+        )),
+        reraise=True
+    )
+
+class _BatchQueue:
+    """Micro-batcher that marshals items arriving within a short window into one call.
+
+    Items submitted while a batch is being collected (up to max_items or
+    flush_ms, whichever comes first) share a single flush() invocation;
+    each submitter awaits its own slot of the result list. Trades a few
+    milliseconds of added latency for far fewer requests against the
+    provider's rate limit under load.
+    """
+
+    def __init__(self, flush, max_items: int = 8, flush_ms: int = 50):
+        self._flush = flush  # async callable: list of items -> list of results
+        self.max_items = max_items
+        self.flush_seconds = flush_ms / 1000
+        self._queue = asyncio.Queue()
+        self._worker = None
+
+    async def submit(self, item):
+        """Queue an item and await its result from the batched call"""
+        # Worker starts lazily - there's no running loop at construction time
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, fut))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_seconds
+            while len(batch) < self.max_items:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await self._flush([item for item, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
 class OpenAIService:
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.model = os.getenv("GPT_MODEL", "gpt-3.5-turbo")
-        self.max_tokens = int(os.getenv("MAX_TOKENS", 1000))
-        self.temperature = float(os.getenv("TEMPERATURE", 0.7))
-    
-    async def generate_summary(self, text: str, max_length: int = 300) -> str:
-        """Generate a summary of the PDF content"""
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # Async client over a pooled httpx transport: the sync client would
+        # pin the event loop for the full API latency, serializing concurrent
+        # users; keep-alive connections skip TLS setup on subsequent calls.
+        # A caller-provided client is reused (one pool across services) and
+        # stays the caller's to close.
+        if http_client is not None:
+            self._http = http_client
+            self._owns_http = False
+        else:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=60.0
+            )
+            self._owns_http = True
+        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=self._http)
+        cfg = _load_config()
+        self.model = cfg.model
+        self.max_tokens = cfg.max_tokens
+        self.temperature = cfg.temperature
+        self.context_window = cfg.context_window
+
+        # Tokenizer for budget-aware truncation; None falls back to a rough
+        # chars-per-token estimate
+        if tiktoken:
+            try:
+                self._enc = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                self._enc = tiktoken.get_encoding("cl100k_base")
+        else:
+            self._enc = None
+
+        # Memoized system messages keyed by (context hash, language): the
+        # system+context prefix is by far the largest part of the prompt and
+        # must be byte-identical across turns for OpenAI's server-side
+        # prompt cache to hit on it
+        self._system_msg_cache = {}
+
+        # Memoized token counts: system messages and history turns recur
+        # verbatim across requests, so their BPE work is paid once instead
+        # of on every budget calculation
+        self._token_count_cache = {}
+
+        # In-flight request registry for single-flight deduplication:
+        # concurrent identical calls (N users analyzing the same viral PDF)
+        # collapse to one API call whose result fans out to all waiters
+        self._inflight = {}
+
+        # Per-target-language micro-batchers for translate_text, created
+        # lazily so each batch shares one target language
+        self._translate_batchers = {}
+
+        # Circuit breaker over _call_openai: after enough consecutive
+        # failures, calls fail fast for a cooldown window instead of piling
+        # retries onto a hard outage
+        self._breaker_fail_max = cfg.breaker_fail_max
+        self._breaker_reset_seconds = cfg.breaker_reset_seconds
+        self._breaker_failures = 0
+        self._breaker_opened_at = 0.0
+
+        # Response cache for the document-analysis methods: re-uploading the
+        # same PDF returns stored completions instead of re-billing the full
+        # round-trip. Persistent when diskcache is installed, plain
+        # in-process dict otherwise.
+        self.cache_ttl = cfg.cache_ttl
+        if diskcache:
+            self._response_cache = diskcache.Cache(".openai_cache")
+        else:
+            self._response_cache = {}
+
+    def _build_state_key(self, kind: str, text: str, **extra) -> str:
+        """Build a deterministic cache key over everything that affects the response"""
+        state = {
+            'kind': kind,
+            'model': self.model,
+            'temperature': self.temperature,
+            'max_tokens': self.max_tokens,
+            'text': text,
+        }
+        state.update(extra)
+        canonical = json.dumps(state, sort_keys=True, ensure_ascii=False)
+        return hashlib.blake2b(canonical.encode('utf-8')).hexdigest()
+
+    def _cache_get(self, key: str):
+        """Look up a cached response, honoring TTL for the dict fallback"""
+        if diskcache:
+            return self._response_cache.get(key)
+
+        entry = self._response_cache.get(key)
+        if entry:
+            expires_at, value = entry
+            if time.time() < expires_at:
+                return value
+            del self._response_cache[key]
+        return None
+
+    def _cache_set(self, key: str, value):
+        """Store a response in the cache"""
+        if diskcache:
+            self._response_cache.set(key, value, expire=self.cache_ttl)
+        else:
+            self._response_cache[key] = (time.time() + self.cache_ttl, value)
+
+    async def close(self):
+        """Release pooled HTTP connections, if this service owns them"""
+        if self._owns_http:
+            await self._http.aclose()
+
+    async def _call_openai(self, **kwargs):
+        """Issue a chat completion with retry/backoff behind the circuit breaker.
+
+        Transient errors (rate limits, connection drops, 5xx) retry with
+        jittered exponential backoff; once failures accumulate past the
+        breaker limit, calls fail fast until the cooldown elapses and a
+        probe request is let through.
+        """
+        if self._breaker_failures >= self._breaker_fail_max:
+            if time.time() - self._breaker_opened_at < self._breaker_reset_seconds:
+                raise ConnectionError("OpenAI circuit breaker open; failing fast")
+            # Half-open: let one caller probe whether the API recovered
+            self._breaker_failures = 0
+
+        try:
+            async for attempt in _api_retrying():
+                with attempt:
+                    response = await self.client.chat.completions.create(**kwargs)
+        except Exception:
+            self._breaker_failures += 1
+            self._breaker_opened_at = time.time()
+            raise
+
+        self._breaker_failures = 0
+        return response
+
+    async def _single_flight(self, key: str, call):
+        """Run call() once per key; concurrent duplicates await the same result.
+
+        Sits below the response cache (which handles repeats over time) and
+        above the API call (so a thundering herd pays for one request).
+        """
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await existing
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            result = await call()
+        except BaseException as e:
+            # BaseException so a cancelled leader (client disconnect) still
+            # resolves the shared future - otherwise every duplicate parked
+            # on it would hang forever
+            if not fut.done():
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in a string, estimating when tiktoken is unavailable"""
+        if self._enc:
+            return len(self._enc.encode(text))
+        return len(text) // 4 + 1
+
+    def _count_tokens_cached(self, text: str) -> int:
+        """Token count with memoization for strings that repeat across requests"""
+        cached = self._token_count_cache.get(text)
+        if cached is None:
+            cached = self._count_tokens(text)
+            if len(self._token_count_cache) > 4096:
+                self._token_count_cache.clear()
+            self._token_count_cache[text] = cached
+        return cached
+
+    def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """Truncate text on a token boundary; falls back to a character slice"""
+        if self._enc:
+            tokens = self._enc.encode(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return self._enc.decode(tokens[:max_tokens])
+        return text[:max_tokens * 4]
+
+    def _fit_history(self, chat_history: List[ChatMessage], budget: int) -> List[dict]:
+        """Select the longest suffix of history that fits a token budget.
+
+        A fixed message count lets one pasted 3000-token excerpt blow the
+        context window while short chats waste it; counting tokens keeps the
+        prompt within budget regardless of message length. ~4 tokens per
+        message cover the role/format overhead.
+        """
+        selected = []
+        used = 0
+        for msg in reversed(chat_history):
+            cost = self._count_tokens_cached(msg.content) + 4
+            if used + cost > budget:
+                break
+            selected.append({"role": msg.role, "content": msg.content})
+            used += cost
+        selected.reverse()
+        return selected
+
+    # How many turns a window accumulates before resetting; larger values
+    # mean longer identical prefixes between resets
+    _WINDOW_MAX_TURNS = 20
+
+    def _stable_history_window(self, chat_history: List[ChatMessage]) -> List[ChatMessage]:
+        """Append-only history window for prompt-prefix stability.
+
+        A sliding last-N window shifts by one every turn, invalidating the
+        cached prefix each request. Here the window start stays fixed while
+        the window grows up to _WINDOW_MAX_TURNS messages, then jumps
+        forward - so between resets every request extends the previous one.
+        """
+        start = (max(0, len(chat_history) - 1) // self._WINDOW_MAX_TURNS) * self._WINDOW_MAX_TURNS
+        return chat_history[start:]
+
+
+    async def analyze_document(self, text: str, max_length: int = 300, bypass_cache: bool = False) -> dict:
+        """Analyze a document in a single API call.
+
+        Returns {'summary': str, 'topics': [str], 'questions': [str]}.
+        Summary, topics and questions used to be three separate completions
+        over the same text - one JSON-mode request cuts the upload path to a
+        single round-trip and sends the document tokens once instead of
+        three times.
+        """
         try:
             # Truncate text if too long for API
             if len(text) > 8000:  # Leave room for prompt
                 text = text[:8000] + "..."
-            
-            prompt = f"""
-            Please provide a concise summary of the following document. 
-            Focus on the main topics, key points, and overall content structure.
-            Keep the summary under {max_length} words.
-            
-            Document content:
-            {text}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that creates clear and informative document summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-            
-            return response.choices[0].message.content.strip()
-        
+
+            cache_key = self._build_state_key('analyze', text, max_length=max_length)
+            if not bypass_cache:
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            prompt = _ANALYZE_PROMPT_TMPL.format(max_length=max_length, text=text)
+
+            async def _call() -> dict:
+                response = await self._call_openai(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": "You are an expert document analyst. Always respond with a single valid JSON object."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    response_format={"type": "json_object"},
+                    max_tokens=800,
+                    temperature=self.temperature
+                )
+                parsed = json.loads(response.choices[0].message.content)
+                return {
+                    'summary': str(parsed.get('summary', '')).strip(),
+                    'topics': [str(t).strip() for t in parsed.get('topics', [])][:10],
+                    'questions': [str(q).strip() for q in parsed.get('questions', [])][:5]
+                }
+
+            analysis = await self._single_flight(cache_key, _call)
+            self._cache_set(cache_key, analysis)
+            return analysis
+
         except Exception as e:
-            raise ValueError(f"Error generating summary: {str(e)}")
+            raise ValueError(f"Error analyzing document: {str(e)}")
+
+    async def generate_summary(self, text: str, max_length: int = 300, bypass_cache: bool = False) -> str:
+        """Generate a summary of the PDF content"""
+        analysis = await self.analyze_document(text, max_length=max_length, bypass_cache=bypass_cache)
+        return analysis['summary']
     
     async def generate_chat_response(
         self, 
@@ -51,201 +468,220 @@ class OpenAIService:
     ) -> str:
         """Generate AI response for chat with PDF"""
         try:
-            # Prepare system message with context
-            system_message = self._build_system_message(context, language)
-            
-            # Build conversation history
-            messages = [{"role": "system", "content": system_message}]
-            
-            # Add chat history
-            for msg in chat_history[-10:]:  # Keep last 10 messages for context
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-            
-            # Add current user message
-            messages.append({"role": "user", "content": message})
-            
-            response = self.client.chat.completions.create(
+            messages = self._build_chat_messages(message, context, language, chat_history)
+
+            flight_key = hashlib.blake2b(
+                json.dumps(messages, sort_keys=True, ensure_ascii=False).encode('utf-8')
+            ).hexdigest()
+
+            async def _call() -> str:
+                response = await self._call_openai(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=self.max_tokens,
+                    temperature=self.temperature
+                )
+                return response.choices[0].message.content.strip()
+
+            return await self._single_flight(flight_key, _call)
+
+        except Exception as e:
+            raise ValueError(f"Error generating chat response: {str(e)}")
+
+    def _build_chat_messages(
+        self,
+        message: str,
+        context: str,
+        language: str,
+        chat_history: List[ChatMessage]
+    ) -> List[dict]:
+        """Assemble the system/history/user message list within the token budget"""
+        # Prepare system message with context
+        system_message = self._build_system_message(context, language)
+
+        # Spend whatever the system message, reply budget and current
+        # turn leave over on history, newest messages first
+        history_budget = (
+            self.context_window
+            - self.max_tokens
+            - self._count_tokens_cached(system_message)
+            - self._count_tokens(message)
+            - 200  # format overhead / safety margin
+        )
+
+        # Append-only history window: the window start only advances on
+        # periodic resets, so consecutive turns share an identical
+        # prefix and OpenAI's prefix cache covers the expensive
+        # system+context tokens. Token budgeting still caps overflow.
+        window = self._stable_history_window(chat_history)
+
+        messages = [{"role": "system", "content": system_message}]
+        messages.extend(self._fit_history(window, max(0, history_budget)))
+
+        # Add current user message
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    async def stream_chat_response(
+        self,
+        message: str,
+        context: str = "",
+        language: str = "en-US",
+        chat_history: List[ChatMessage] = []
+    ):
+        """Stream the chat response as text deltas while it is generated.
+
+        Yields content fragments as they arrive, so callers can render
+        tokens at time-to-first-token instead of waiting out the full
+        generation. The non-streaming generate_chat_response remains for
+        paths that need the whole answer (caching, voice synthesis).
+        """
+        try:
+            messages = self._build_chat_messages(message, context, language, chat_history)
+
+            stream = await self._call_openai(
                 model=self.model,
                 messages=messages,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature
+                temperature=self.temperature,
+                stream=True
             )
-            
-            return response.choices[0].message.content.strip()
-        
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
         except Exception as e:
             raise ValueError(f"Error generating chat response: {str(e)}")
     
     def _build_system_message(self, context: str, language: str) -> str:
         """Build system message with document context and language instructions"""
+        cache_key = (hashlib.blake2b(context.encode('utf-8'), digest_size=16).hexdigest(), language)
+        cached = self._system_msg_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         language_instruction = self._get_language_instruction(language)
-        
+
         if context:
-            # Truncate context if too long
-            if len(context) > 6000:
-                context = context[:6000] + "\n\n[Document truncated for length...]"
-            
-            system_message = f"""
-            You are an AI assistant helping users understand and discuss a document. 
-            {language_instruction}
-            
-            Here is the document content for reference:
-            
-            {context}
-            
-            Instructions:
-            - Answer questions based on the document content when possible
-            - If information isn't in the document, clearly state that
-            - Be helpful, accurate, and conversational
-            - Provide specific references to document sections when relevant
-            - If asked about topics not in the document, provide general helpful information but note it's not from the document
-            """
+            # Truncate context on a token boundary - a character cap
+            # undercounts CJK text badly and overshoots the real budget
+            truncated = self._truncate_to_tokens(context, 5500)
+            if len(truncated) < len(context):
+                context = truncated + "\n\n[Document truncated for length...]"
+
+            system_message = _CONTEXT_SYSTEM_TMPL.format(
+                language_instruction=language_instruction,
+                context=context
+            )
         else:
-            system_message = f"""
-            You are a helpful AI assistant. 
-            {language_instruction}
-            
-            Instructions:
-            - Provide helpful and accurate responses
-            - Be conversational and friendly
-            - If you don't know something, admit it honestly
-            """
-        
+            system_message = _NO_CONTEXT_SYSTEM_TMPL.format(
+                language_instruction=language_instruction
+            )
+
+        self._system_msg_cache[cache_key] = system_message
         return system_message
     
-    def _get_language_instruction(self, language: str) -> str:
+    @staticmethod
+    def _get_language_instruction(language: str) -> str:
         """Get language-specific instructions"""
-        language_map = {
-            "en-US": "Respond in clear, natural English.",
-            "en-GB": "Respond in British English.",
-            "es-ES": "Responde en español claro y natural.",
-            "es-MX": "Responde en español mexicano claro y natural.",
-            "fr-FR": "Répondez en français clair et naturel.",
-            "de-DE": "Antworten Sie in klarem, natürlichem Deutsch.",
-            "it-IT": "Rispondi in italiano chiaro e naturale.",
-            "pt-BR": "Responda em português brasileiro claro e natural.",
-            "ja-JP": "自然で明確な日本語で答えてください。",
-            "ko-KR": "명확하고 자연스러운 한국어로 답변해주세요.",
-            "zh-CN": "请用清晰、自然的中文回答。",
-            "hi-IN": "स्पष्ट और प्राकृतिक हिंदी में जवाब दें।",
-            "ar-SA": "أجب باللغة العربية الواضحة والطبيعية."
-        }
-        
-        return language_map.get(language, "Respond in clear, natural English.")
+        return _LANG_INSTRUCTIONS.get(language, _LANG_INSTRUCTIONS["en-US"])
     
-    async def extract_key_topics(self, text: str) -> List[str]:
+    async def extract_key_topics(self, text: str, bypass_cache: bool = False) -> List[str]:
         """Extract key topics from document"""
         try:
-            if len(text) > 8000:
-                text = text[:8000] + "..."
-            
-            prompt = f"""
-            Analyze the following document and extract the main topics and themes.
-            Return a list of 5-10 key topics, each as a brief phrase or keyword.
-            Format as a simple comma-separated list.
-            
-            Document content:
-            {text}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert at analyzing documents and identifying key topics."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.5
-            )
-            
-            # Parse the response into a list
-            topics_text = response.choices[0].message.content.strip()
-            topics = [topic.strip() for topic in topics_text.split(',')]
-            return topics[:10]  # Limit to 10 topics
-        
+            analysis = await self.analyze_document(text, bypass_cache=bypass_cache)
+            return analysis['topics']
         except Exception as e:
             return []  # Return empty list if extraction fails
-    
-    async def generate_questions(self, text: str) -> List[str]:
+
+    async def generate_questions(self, text: str, bypass_cache: bool = False) -> List[str]:
         """Generate suggested questions based on document content"""
         try:
-            if len(text) > 8000:
-                text = text[:8000] + "..."
-            
-            prompt = f"""
-            Based on the following document, generate 5 thoughtful questions that readers might want to ask.
-            Make the questions specific to the document content and varied in type (factual, analytical, clarifying).
-            Format as a numbered list.
-            
-            Document content:
-            {text}
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert at creating insightful questions about documents."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=300,
-                temperature=0.7
-            )
-            
-            # Parse questions from response
-            questions_text = response.choices[0].message.content.strip()
-            questions = []
-            
-            for line in questions_text.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-') or line.startswith('•')):
-                    # Remove numbering/bullets and clean up
-                    question = line.split('.', 1)[-1].strip() if '.' in line else line
-                    question = question.lstrip('- •').strip()
-                    if question:
-                        questions.append(question)
-            
-            return questions[:5]  # Limit to 5 questions
-        
+            analysis = await self.analyze_document(text, bypass_cache=bypass_cache)
+            return analysis['questions']
         except Exception as e:
             return []  # Return empty list if generation fails
     
-    async def translate_text(self, text: str, target_language: str) -> str:
+    async def translate_text(self, text: str, target_language: str, bypass_cache: bool = False) -> str:
         """Translate text to target language"""
         try:
-            language_names = {
-                "es-ES": "Spanish",
-                "fr-FR": "French", 
-                "de-DE": "German",
-                "it-IT": "Italian",
-                "pt-BR": "Portuguese",
-                "ja-JP": "Japanese",
-                "ko-KR": "Korean",
-                "zh-CN": "Chinese",
-                "hi-IN": "Hindi",
-                "ar-SA": "Arabic"
-            }
-            
-            target_lang_name = language_names.get(target_language, "English")
+            target_lang_name = _TRANSLATE_LANG_NAMES.get(target_language, "English")
             
             if target_language.startswith("en"):
                 return text  # No translation needed for English
-            
-            prompt = f"Translate the following text to {target_lang_name}:\n\n{text}"
-            
-            response = self.client.chat.completions.create(
+
+            cache_key = self._build_state_key('translate', text, target_language=target_language)
+            if not bypass_cache:
+                cached = self._cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            # Route through the micro-batcher: concurrent pending
+            # translations to the same language share one API call
+            batcher = self._translate_batchers.get(target_language)
+            if batcher is None:
+                batcher = _BatchQueue(functools.partial(self._translate_batch, target_lang_name=target_lang_name))
+                self._translate_batchers[target_language] = batcher
+
+            translated = await self._single_flight(cache_key, functools.partial(batcher.submit, text))
+            self._cache_set(cache_key, translated)
+            return translated
+
+        except Exception as e:
+            return text  # Return original if translation fails
+
+    async def _translate_single(self, text: str, target_lang_name: str) -> str:
+        """Translate one text with its own API call"""
+        response = await self._call_openai(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": f"You are a professional translator. Translate text accurately to {target_lang_name}."},
+                {"role": "user", "content": f"Translate the following text to {target_lang_name}:\n\n{text}"}
+            ],
+            max_tokens=self.max_tokens,
+            temperature=0.3
+        )
+        return response.choices[0].message.content.strip()
+
+    async def _translate_batch(self, texts: List[str], target_lang_name: str) -> List[str]:
+        """Translate a batch of texts in one numbered-list API call.
+
+        Falls back to individual calls when the batched response can't be
+        parsed or doesn't cover every input.
+        """
+        if len(texts) == 1:
+            return [await self._translate_single(texts[0], target_lang_name)]
+
+        try:
+            numbered = "\n\n".join(f"{i + 1}. {text}" for i, text in enumerate(texts))
+            prompt = (
+                f"Translate each numbered text to {target_lang_name}. "
+                'Return a JSON object {"translations": [{"i": <number>, "text": <translation>}]} '
+                f"with one entry per input:\n\n{numbered}"
+            )
+
+            response = await self._call_openai(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": f"You are a professional translator. Translate text accurately to {target_lang_name}."},
+                    {"role": "system", "content": f"You are a professional translator. Translate text accurately to {target_lang_name}. Always respond with a single valid JSON object."},
                     {"role": "user", "content": prompt}
                 ],
+                response_format={"type": "json_object"},
                 max_tokens=self.max_tokens,
                 temperature=0.3
             )
-            
-            return response.choices[0].message.content.strip()
-        
+
+            parsed = json.loads(response.choices[0].message.content)
+            by_index = {int(entry["i"]): str(entry["text"]).strip() for entry in parsed.get("translations", [])}
+            if all(i + 1 in by_index for i in range(len(texts))):
+                return [by_index[i + 1] for i in range(len(texts))]
+            logger.warning("Batched translation response incomplete, retrying individually")
+
         except Exception as e:
-            return text  # Return original if translation fails
+            logger.warning("Batched translation failed, retrying individually: %s", e)
+
+        return list(await asyncio.gather(*[
+            self._translate_single(text, target_lang_name) for text in texts
+        ]))
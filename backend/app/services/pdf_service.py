@@ -1,67 +1,192 @@
 import os
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from collections import defaultdict
 import aiofiles
 from fastapi import UploadFile
 import PyPDF2
 import pdfplumber
+from dataclasses import dataclass
 from typing import Optional
 import uuid
-from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class _PDFConfig:
+    """Env-derived settings, read once per process instead of per construction"""
+    upload_dir: str
+    max_file_size: int
+
+@functools.lru_cache(maxsize=1)
+def _load_config() -> _PDFConfig:
+    return _PDFConfig(
+        upload_dir=os.getenv("UPLOAD_DIR", "../uploads"),
+        max_file_size=int(os.getenv("MAX_FILE_SIZE", 10485760))  # 10MB
+    )
+
+# Below this page count the fork/spawn overhead of a process pool costs more
+# than the parallelism buys back
+_POOL_MIN_PAGES = 4
+
+# Sentence splitter that respects ., ! and ? followed by whitespace - unlike
+# a bare split('.') it doesn't shred decimals and abbreviations as badly
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+_TOKEN_RE = re.compile(r'\w+')
+_WORD_RE = re.compile(r'\S+')
+
+def _build_search_index(text: str):
+    """Split text into sentences and build a token -> sentence-ids inverted index"""
+    sentences = _SENTENCE_SPLIT_RE.split(text)
+    index = defaultdict(set)
+    for i, sentence in enumerate(sentences):
+        for token in _TOKEN_RE.findall(sentence.lower()):
+            index[token].add(i)
+    return sentences, index
+
+def _extract_page(file_path: str, page_no: int) -> str:
+    """Extract one page's text; runs in a pool worker, so the PDF is reopened per process"""
+    with pdfplumber.open(file_path) as pdf:
+        return pdf.pages[page_no].extract_text() or ""
+
+def _extract_sync(file_path: str) -> str:
+    """Extract all text from a PDF, fanning pages out to a process pool for large documents"""
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        if page_count < _POOL_MIN_PAGES:
+            texts = [page.extract_text() or "" for page in pdf.pages]
+            return "".join(text + "\n\n" for text in texts if text)
+
+    # pdfplumber holds the GIL for most of its parse, so threads don't help;
+    # processes reparse page-by-page on separate cores
+    workers = min(os.cpu_count() or 1, page_count)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        texts = pool.map(functools.partial(_extract_page, file_path), range(page_count))
+    return "".join(text + "\n\n" for text in texts if text)
+
+def _extract_sync_pypdf2(file_path: str) -> str:
+    """Fallback extraction via PyPDF2 for PDFs pdfplumber returns nothing for"""
+    extracted_text = ""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        for page in pdf_reader.pages:
+            extracted_text += page.extract_text() + "\n\n"
+    return extracted_text
 
 class PDFService:
     def __init__(self):
-        self.upload_dir = os.getenv("UPLOAD_DIR", "../uploads")
-        self.max_file_size = int(os.getenv("MAX_FILE_SIZE", 10485760))  # 10MB
+        cfg = _load_config()
+        self.upload_dir = cfg.upload_dir
+        self.max_file_size = cfg.max_file_size
         
         # Create upload directory if it doesn't exist
         os.makedirs(self.upload_dir, exist_ok=True)
-        
-        # Store extracted text in memory (in production, use a database)
-        self.pdf_texts = {}
-    
+
+        # Extracted text lives in SQLite so it survives restarts and is
+        # shared across Uvicorn workers instead of leaking per-process
+        self._db = sqlite3.connect(
+            os.path.join(self.upload_dir, "pdf_texts.db"),
+            check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pdf_text ("
+            "file_id TEXT PRIMARY KEY, text TEXT, extracted_at REAL, file_path TEXT)"
+        )
+        self._db.commit()
+
+        # Per-document inverted index for search_in_pdf, built lazily on
+        # first query and kept in memory (text itself lives in SQLite)
+        self._search_index = {}
+
+        # Computed statistics per document - the text is immutable once
+        # extracted, so stats are calculated at most once
+        self._stats_cache = {}
+
+    def _store_text(self, file_id: str, text: str, file_path: str):
+        """Persist extracted text for a PDF"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO pdf_text (file_id, text, extracted_at, file_path) VALUES (?, ?, ?, ?)",
+            (file_id, text, time.time(), file_path)
+        )
+        self._db.commit()
+        self._search_index.pop(file_id, None)
+        self._stats_cache.pop(file_id, None)
+
+    def _get_record(self, file_id: str):
+        """Fetch the stored (text, extracted_at, file_path) row for a PDF, or None"""
+        row = self._db.execute(
+            "SELECT text, extracted_at, file_path FROM pdf_text WHERE file_id = ?",
+            (file_id,)
+        ).fetchone()
+        return row
+
     async def save_uploaded_file(self, file: UploadFile) -> str:
-        """Save uploaded PDF file to disk"""
-        # Check file size
-        contents = await file.read()
-        if len(contents) > self.max_file_size:
-            raise ValueError("File too large")
-        
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        filename = f"{file_id}.pdf"
-        file_path = os.path.join(self.upload_dir, filename)
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(contents)
-        
+        """Save uploaded PDF file to disk, deduplicating identical uploads by content hash"""
+        # Stream to a temp name first - the content hash that names the
+        # final file isn't known until the last chunk
+        tmp_path = os.path.join(self.upload_dir, f".upload_{uuid.uuid4()}.tmp")
+
+        # Stream the upload to disk in chunks - reading the whole file first
+        # doubles peak memory and risks OOM under concurrent large uploads
+        sha = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                while chunk := await file.read(1 << 20):
+                    size += len(chunk)
+                    if size > self.max_file_size:
+                        raise ValueError("File too large")
+                    sha.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            # Any abort mid-stream - size limit, client disconnect, write
+            # error, cancellation - must not leave the temp file behind;
+            # cleanup_old_files only knows about DB-registered paths
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Content-hashed file_id: re-uploading the same bytes maps to the
+        # same file and the same cached extraction
+        file_id = sha.hexdigest()
+        file_path = os.path.join(self.upload_dir, f"{file_id}.pdf")
+        if os.path.exists(file_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, file_path)
+
         return file_path
     
     async def extract_text(self, file_path: str) -> str:
         """Extract text from PDF using pdfplumber (more accurate than PyPDF2)"""
         try:
-            extracted_text = ""
-            
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        extracted_text += text + "\n\n"
-            
+            # Content-hashed filenames make the stored text a parse cache:
+            # a previously-seen document skips pdfplumber entirely
+            file_id = os.path.basename(file_path).split('.')[0]
+            row = self._get_record(file_id)
+            if row:
+                return row[0]
+
+            # Parse off the event loop - extraction takes seconds on large
+            # PDFs and would otherwise block every other request
+            extracted_text = await asyncio.to_thread(_extract_sync, file_path)
+
             # If pdfplumber fails, fallback to PyPDF2
             if not extracted_text.strip():
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    for page in pdf_reader.pages:
-                        extracted_text += page.extract_text() + "\n\n"
-            
-            # Store extracted text in memory
-            file_id = os.path.basename(file_path).split('.')[0]
-            self.pdf_texts[file_id] = {
-                'text': extracted_text,
-                'extracted_at': datetime.now(),
-                'file_path': file_path
-            }
-            
+                extracted_text = await asyncio.to_thread(_extract_sync_pypdf2, file_path)
+
+            # Persist extracted text
+            self._store_text(file_id, extracted_text, file_path)
+
             return extracted_text
         
         except Exception as e:
@@ -74,25 +199,30 @@ class PDFService:
             # If it's a full path, extract just the file_id
             file_id = os.path.basename(file_id).split('.')[0]
         
-        if file_id in self.pdf_texts:
-            return self.pdf_texts[file_id]['text']
-        else:
-            # Try to find by checking if file_id is part of the path
-            for stored_id, data in self.pdf_texts.items():
-                if stored_id == file_id or file_id in data.get('file_path', ''):
-                    return data['text']
-            
-            raise ValueError(f"PDF with ID {file_id} not found")
+        row = self._get_record(file_id)
+        if row:
+            return row[0]
+
+        # Try to find by checking if file_id is part of the path
+        row = self._db.execute(
+            "SELECT text FROM pdf_text WHERE file_path LIKE ?",
+            (f"%{file_id}%",)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        raise ValueError(f"PDF with ID {file_id} not found")
     
     def get_pdf_info(self, file_id: str) -> Optional[dict]:
         """Get information about a processed PDF"""
-        if file_id in self.pdf_texts:
-            pdf_data = self.pdf_texts[file_id]
+        row = self._get_record(file_id)
+        if row:
+            text, extracted_at, file_path = row
             return {
                 'file_id': file_id,
-                'text_length': len(pdf_data['text']),
-                'extracted_at': pdf_data['extracted_at'],
-                'file_path': pdf_data['file_path']
+                'text_length': len(text),
+                'extracted_at': extracted_at,
+                'file_path': file_path
             }
         return None
     
@@ -101,98 +231,129 @@ class PDFService:
         if len(text) <= chunk_size:
             return [text]
         
+        # Collect every paragraph and sentence boundary in one pass, then
+        # each chunk picks its break with a binary search instead of
+        # rfind re-scanning overlapping windows of the text
+        para_breaks = [m.start() for m in re.finditer(r'\n\n', text)]
+        sent_breaks = [m.start() + 1 for m in re.finditer(r'(?<=[.!?])\s', text)]
+
         chunks = []
         start = 0
-        
+
         while start < len(text):
             end = start + chunk_size
-            
+
             # Try to break at sentence or paragraph boundary
             if end < len(text):
                 # Look for paragraph break
-                last_para = text.rfind('\n\n', start, end)
-                if last_para > start:
-                    end = last_para
+                idx = bisect.bisect_right(para_breaks, end) - 1
+                if idx >= 0 and para_breaks[idx] > start:
+                    end = para_breaks[idx]
                 else:
                     # Look for sentence break
-                    last_sentence = text.rfind('.', start, end)
-                    if last_sentence > start:
-                        end = last_sentence + 1
-            
+                    idx = bisect.bisect_right(sent_breaks, end) - 1
+                    if idx >= 0 and sent_breaks[idx] > start:
+                        end = sent_breaks[idx]
+
             chunk = text[start:end].strip()
             if chunk:
                 chunks.append(chunk)
-            
+
             start = max(start + 1, end - overlap)
-        
+
         return chunks
     
     async def search_in_pdf(self, file_id: str, query: str) -> list:
         """Search for specific content in PDF"""
-        if file_id not in self.pdf_texts:
+        row = self._get_record(file_id)
+        if not row:
             raise ValueError(f"PDF with ID {file_id} not found")
-        
-        text = self.pdf_texts[file_id]['text']
+
+        # Build the inverted index once per document; queries then touch
+        # only the posting lists instead of rescanning the full text
+        if file_id not in self._search_index:
+            self._search_index[file_id] = _build_search_index(row[0])
+        sentences, index = self._search_index[file_id]
+
+        query_tokens = _TOKEN_RE.findall(query.lower())
+        if not query_tokens:
+            return []
+
+        # Intersect posting lists - candidates are only sentences containing
+        # every query token
+        candidates = index.get(query_tokens[0], set())
+        for token in query_tokens[1:]:
+            candidates = candidates & index.get(token, set())
+            if not candidates:
+                return []
+
         query_lower = query.lower()
         results = []
-        
-        # Split into sentences for context
-        sentences = text.split('.')
-        
-        for i, sentence in enumerate(sentences):
-            if query_lower in sentence.lower():
-                # Get some context around the match
+        for i in sorted(candidates):
+            # Verify the exact phrase on the handful of candidates
+            if len(query_tokens) == 1 or query_lower in sentences[i].lower():
                 start_idx = max(0, i - 1)
                 end_idx = min(len(sentences), i + 2)
-                context = '. '.join(sentences[start_idx:end_idx])
-                
+                context = ' '.join(sentences[start_idx:end_idx])
+
                 results.append({
                     'context': context.strip(),
                     'sentence_index': i,
-                    'match': sentence.strip()
+                    'match': sentences[i].strip()
                 })
-        
+
         return results
     
     def cleanup_old_files(self, max_age_hours: int = 24):
         """Clean up old uploaded files"""
-        current_time = datetime.now()
-        to_remove = []
-        
-        for file_id, data in self.pdf_texts.items():
-            age = current_time - data['extracted_at']
-            if age.total_seconds() > (max_age_hours * 3600):
-                to_remove.append(file_id)
-        
-        for file_id in to_remove:
-            # Remove from memory
-            pdf_data = self.pdf_texts.pop(file_id)
-            
+        cutoff = time.time() - max_age_hours * 3600
+        expired = self._db.execute(
+            "SELECT file_id, file_path FROM pdf_text WHERE extracted_at < ?",
+            (cutoff,)
+        ).fetchall()
+
+        for file_id, file_path in expired:
+            self._db.execute("DELETE FROM pdf_text WHERE file_id = ?", (file_id,))
+            self._search_index.pop(file_id, None)
+            self._stats_cache.pop(file_id, None)
+
             # Remove file from disk
             try:
-                if os.path.exists(pdf_data['file_path']):
-                    os.remove(pdf_data['file_path'])
+                if os.path.exists(file_path):
+                    os.remove(file_path)
             except Exception as e:
-                print(f"Error removing file {pdf_data['file_path']}: {e}")
+                logger.warning("Error removing file %s: %s", file_path, e)
+
+        if expired:
+            self._db.commit()
     
     def get_text_statistics(self, file_id: str) -> dict:
         """Get statistics about the extracted text"""
-        if file_id not in self.pdf_texts:
+        cached = self._stats_cache.get(file_id)
+        if cached is not None:
+            return cached
+
+        row = self._get_record(file_id)
+        if not row:
             raise ValueError(f"PDF with ID {file_id} not found")
-        
-        text = self.pdf_texts[file_id]['text']
-        
-        word_count = len(text.split())
+
+        text = row[0]
+
+        # finditer counts words without materializing the list of string
+        # objects that text.split() would allocate
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
         char_count = len(text)
         paragraph_count = text.count('\n\n') + 1
-        
+
         # Estimate reading time (average 200 words per minute)
         reading_time_minutes = word_count / 200
-        
-        return {
+
+        stats = {
             'word_count': word_count,
             'character_count': char_count,
             'paragraph_count': paragraph_count,
             'estimated_reading_time_minutes': round(reading_time_minutes, 1),
             'text_preview': text[:500] + ('...' if len(text) > 500 else '')
         }
+        self._stats_cache[file_id] = stats
+        return stats
@@ -1,4 +1,6 @@
 import os
+import asyncio
+import logging
 import speech_recognition as sr
 import aiofiles
 from fastapi import UploadFile
@@ -8,16 +10,101 @@ import io
 from typing import Optional
 import tempfile
 
+logger = logging.getLogger(__name__)
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# In-memory audio decode/resample stack; pydub (which shells out to ffmpeg
+# and round-trips temp files) stays as fallback for codecs soundfile
+# can't open
+try:
+    import numpy as np
+    import soundfile
+    from scipy import signal as scipy_signal
+except ImportError:
+    np = soundfile = scipy_signal = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+if numba is not None and np is not None:
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _frame_rms(data, frame):
+        """Per-frame RMS energies over a 1-D sample array (JIT-compiled)"""
+        n = len(data) // frame
+        out = np.empty(n, dtype=np.float64)
+        for i in numba.prange(n):
+            acc = 0.0
+            for j in range(i * frame, (i + 1) * frame):
+                acc += data[j] * data[j]
+            out[i] = (acc / frame) ** 0.5
+        return out
+
+    # Trigger compilation at import so the first request doesn't pay it
+    try:
+        _frame_rms(np.zeros(4, dtype=np.float64), 2)
+    except Exception:
+        _frame_rms = None
+else:
+    _frame_rms = None
+
+# Google Speech language codes, frozen at module scope so the map isn't
+# rebuilt on every transcription
+_GOOGLE_LANG = {
+    "en-US": "en-US",
+    "en-GB": "en-GB",
+    "es-ES": "es-ES",
+    "es-MX": "es-MX",
+    "fr-FR": "fr-FR",
+    "de-DE": "de-DE",
+    "it-IT": "it-IT",
+    "pt-BR": "pt-BR",
+    "ja-JP": "ja-JP",
+    "ko-KR": "ko-KR",
+    "zh-CN": "zh-CN",
+    "hi-IN": "hi-IN",
+    "ar-SA": "ar-SA"
+}
+
 class VoiceService:
     def __init__(self):
         self.recognizer = sr.Recognizer()
-        self.temp_dir = tempfile.gettempdir()
+
+        # Temp audio lives on tmpfs where available, so the write/convert/
+        # unlink churn per request never touches real storage
+        shm = "/dev/shm"
+        if os.path.isdir(shm) and os.access(shm, os.W_OK):
+            self.temp_dir = shm
+        else:
+            self.temp_dir = tempfile.gettempdir()
         
-        # Configure recognition settings
+        # Configure recognition settings. Dynamic thresholding is for live
+        # microphones; input here is always a finished file, and the
+        # threshold is derived per clip from the recording itself
         self.recognizer.energy_threshold = 300
-        self.recognizer.dynamic_energy_threshold = True
+        self.recognizer.dynamic_energy_threshold = False
         self.recognizer.pause_threshold = 0.8
         self.recognizer.operation_timeout = 10
+
+        # Local Whisper transcription (CTranslate2 int8) when faster-whisper
+        # is installed: no network round-trip or rate limit per clip, and
+        # several times faster than reference Whisper on CPU. Set
+        # USE_LOCAL_WHISPER=0 to force the speech_recognition path.
+        self.whisper_model = None
+        if WhisperModel and os.getenv("USE_LOCAL_WHISPER", "1") != "0":
+            try:
+                self.whisper_model = WhisperModel(
+                    os.getenv("WHISPER_MODEL", "small"),
+                    device="auto",
+                    compute_type="int8"
+                )
+            except Exception as e:
+                logger.warning("Failed to load faster-whisper model, using speech_recognition: %s", e)
     
     async def save_audio_file(self, audio: UploadFile) -> str:
         """Save uploaded audio file temporarily"""
@@ -37,32 +124,105 @@ class VoiceService:
         
         return temp_path
     
+    def _convert_to_wav_inmemory(self, audio_content: bytes, output_path: str) -> str:
+        """Decode, downmix and resample to 16k/mono/16-bit in one in-memory pass"""
+        data, rate = soundfile.read(io.BytesIO(audio_content), dtype='int16')
+        if data.ndim == 2:
+            data = data.mean(axis=1).astype(np.int16)
+        if rate != 16000:
+            data = scipy_signal.resample_poly(data, 16000, rate).astype(np.int16)
+        soundfile.write(output_path, data, 16000, subtype='PCM_16')
+        return output_path
+
     async def _convert_to_wav(self, audio_content: bytes, output_path: str) -> str:
         """Convert audio content to WAV format"""
+        # Single-pass in-memory conversion when soundfile/scipy are
+        # available - no ffmpeg process spawn, no temp files, and one
+        # resample instead of pydub's three set_* reprocessing passes
+        if soundfile is not None:
+            try:
+                return await asyncio.to_thread(self._convert_to_wav_inmemory, audio_content, output_path)
+            except Exception as decode_error:
+                logger.info("soundfile could not decode upload, using pydub/ffmpeg: %s", decode_error)
+
         try:
             # Create audio segment from bytes
             audio_segment = AudioSegment.from_file(io.BytesIO(audio_content))
-            
+
             # Convert to WAV format with specific parameters for better speech recognition
             audio_segment = audio_segment.set_frame_rate(16000)  # 16kHz sample rate
             audio_segment = audio_segment.set_channels(1)  # Mono
             audio_segment = audio_segment.set_sample_width(2)  # 16-bit
-            
+
             # Export as WAV
             audio_segment.export(output_path, format="wav")
-            
+
             return output_path
-        
+
         except Exception as e:
             raise ValueError(f"Error converting audio to WAV: {str(e)}")
     
+    def _set_energy_threshold_from_file(self, audio_path: str):
+        """Set the recognizer threshold from the recording's own noise floor.
+
+        adjust_for_ambient_noise burned 500ms per call sampling the start of
+        the file as if it were a live microphone. For pre-recorded input the
+        clip itself gives the floor: the 10th percentile of 20ms frame
+        energies sits at the quiet stretches, well below speech frames.
+        """
+        try:
+            if soundfile is not None:
+                data, rate = soundfile.read(audio_path, dtype='int16')
+                if data.ndim == 2:
+                    data = data.mean(axis=1)
+                frame = max(1, rate // 50)  # 20ms frames
+                usable = len(data) - len(data) % frame
+                if usable:
+                    samples = np.ascontiguousarray(data[:usable], dtype=np.float64)
+                    if _frame_rms is not None:
+                        # JIT loop: no (n_frames, frame) intermediate and the
+                        # frame loop runs across cores
+                        energies = _frame_rms(samples, frame)
+                    else:
+                        frames = samples.reshape(-1, frame)
+                        energies = np.sqrt(np.mean(np.square(frames), axis=1))
+                    floor = float(np.percentile(energies, 10))
+                    self.recognizer.energy_threshold = max(50.0, 4 * floor)
+                    return
+
+            # Without numpy, derive a rough threshold from overall loudness
+            rms = AudioSegment.from_file(audio_path).rms
+            self.recognizer.energy_threshold = max(50.0, rms / 4)
+
+        except Exception as e:
+            logger.debug("Energy threshold estimation failed, keeping default: %s", e)
+
+    def _transcribe_whisper(self, audio_path: str, language: str) -> str:
+        """Transcribe locally with faster-whisper; VAD skips silent stretches"""
+        segments, _ = self.whisper_model.transcribe(
+            audio_path,
+            language=language.split('-')[0],
+            vad_filter=True,
+            beam_size=1
+        )
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
     async def transcribe_audio(self, audio_path: str, language: str = "en-US") -> str:
         """Transcribe audio file to text using speech recognition"""
         try:
+            # Prefer the local model; fall through to the Google HTTP path
+            # only when it's unavailable or fails
+            if self.whisper_model:
+                try:
+                    text = await asyncio.to_thread(self._transcribe_whisper, audio_path, language)
+                    if text:
+                        return text
+                    return "Could not understand the audio clearly"
+                except Exception as whisper_error:
+                    logger.warning("Local transcription failed, falling back to speech_recognition: %s", whisper_error)
+
+            self._set_energy_threshold_from_file(audio_path)
             with sr.AudioFile(audio_path) as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
                 # Record the audio
                 audio_data = self.recognizer.record(source)
             
@@ -88,31 +248,16 @@ class VoiceService:
         except Exception as e:
             raise ValueError(f"Error transcribing audio: {str(e)}")
     
-    def _map_language_for_google(self, language: str) -> str:
+    @staticmethod
+    def _map_language_for_google(language: str) -> str:
         """Map our language codes to Google Speech Recognition language codes"""
-        language_map = {
-            "en-US": "en-US",
-            "en-GB": "en-GB", 
-            "es-ES": "es-ES",
-            "es-MX": "es-MX",
-            "fr-FR": "fr-FR",
-            "de-DE": "de-DE",
-            "it-IT": "it-IT",
-            "pt-BR": "pt-BR",
-            "ja-JP": "ja-JP",
-            "ko-KR": "ko-KR",
-            "zh-CN": "zh-CN",
-            "hi-IN": "hi-IN",
-            "ar-SA": "ar-SA"
-        }
-        
-        return language_map.get(language, "en-US")
+        return _GOOGLE_LANG.get(language, "en-US")
     
     async def transcribe_with_confidence(self, audio_path: str, language: str = "en-US") -> dict:
         """Transcribe audio and return confidence score if available"""
         try:
+            self._set_energy_threshold_from_file(audio_path)
             with sr.AudioFile(audio_path) as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 audio_data = self.recognizer.record(source)
             
             # Use Google Speech Recognition with show_all=True to get confidence
@@ -245,6 +390,6 @@ class VoiceService:
                 try:
                     os.remove(file_path)
                 except Exception as e:
-                    print(f"Error removing temp file {filename}: {e}")
+                    logger.warning("Error removing temp file %s: %s", filename, e)
         except Exception as e:
-            print(f"Error during temp file cleanup: {e}")
+            logger.warning("Error during temp file cleanup: %s", e)
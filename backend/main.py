@@ -1,26 +1,81 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
+import asyncio
+import hashlib
+import json
+import logging
+import logging.handlers
+import queue
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import httpx
+import orjson
 from dotenv import load_dotenv
+from pydub import AudioSegment
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging once for the whole app; services use lazy %-style
+# logging so debug messages cost nothing unless LOG_LEVEL enables them
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+# Hand log records to a background thread through a queue: stderr writes
+# are synchronous and, with many concurrent requests logging at once,
+# would otherwise block the event loop on every record
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+
+logger = logging.getLogger(__name__)
+
 # Import our custom modules
 from app.services.pdf_service import PDFService
 from app.services.gemini_service import GeminiService
 from app.services.murf_service import MurfService
 from app.services.voice_service import VoiceService
-from app.models.chat_models import ChatRequest, ChatResponse, VoiceRequest
+from app.models.chat_models import ChatRequest, VoiceRequest
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm upstream clients at startup and release pooled connections at shutdown"""
+    # Without this, the first request after boot pays the TLS handshake and
+    # auth exchange for each upstream (hundreds of ms); both probes also
+    # prime their service-level caches
+    results = await asyncio.gather(
+        gemini_service.test_connection(),
+        murf_service.get_available_voices(),
+        return_exceptions=True
+    )
+    for name, result in zip(("gemini", "murf"), results):
+        if isinstance(result, Exception):
+            logger.warning("%s warmup failed: %s", name, result)
+
+    yield
+
+    await murf_service.close()
+    await http_client.aclose()
+    MURF_POOL.shutdown(wait=False)
 
 app = FastAPI(
     title="Talk to PDF API",
     description="AI-powered PDF chat with voice synthesis using Murf API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson encodes responses several times faster than stdlib json
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -32,31 +87,262 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Static file serving for audio files
-app.mount("/audio", StaticFiles(directory="../audio_files"), name="audio")
+# Audio file serving. An explicit FileResponse route instead of a
+# StaticFiles mount: FileResponse sends the body with os.sendfile where the
+# server supports it (no userspace copy), and the route handles conditional
+# requests so repeat plays 304 instead of re-downloading. Filenames are
+# content-hashed, so responses are immutable.
+AUDIO_DIR = "../audio_files"
+
+@app.get("/audio/{filename}")
+async def serve_audio(filename: str, request: Request):
+    """Serve a synthesized audio file"""
+    # Filenames are generated hashes; anything path-like is bogus
+    if "/" in filename or "\\" in filename or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    path = os.path.join(AUDIO_DIR, filename)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    etag = f'"{int(stat.st_mtime)}-{stat.st_size}"'
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "ETag": etag
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(path, media_type="audio/mpeg", headers=headers, stat_result=stat)
+
+# Processed-upload cache: file_ids are content hashes, so a re-uploaded PDF
+# maps to the same entry and skips extraction + summarization entirely.
+# Backed by small JSON blobs on disk so hits survive restarts, with an
+# in-process dict in front so hot repeats never touch disk.
+UPLOAD_CACHE_DIR = os.getenv("UPLOAD_CACHE_DIR", "../cache")
+os.makedirs(UPLOAD_CACHE_DIR, exist_ok=True)
+_upload_cache = {}
+
+# Static per-deploy data - built once instead of per request
+SUPPORTED_LANGUAGES = (
+    {"code": "en-US", "name": "English (US)"},
+    {"code": "en-GB", "name": "English (UK)"},
+    {"code": "es-ES", "name": "Spanish (Spain)"},
+    {"code": "es-MX", "name": "Spanish (Mexico)"},
+    {"code": "fr-FR", "name": "French"},
+    {"code": "de-DE", "name": "German"},
+    {"code": "it-IT", "name": "Italian"},
+    {"code": "pt-BR", "name": "Portuguese (Brazil)"},
+    {"code": "ja-JP", "name": "Japanese"},
+    {"code": "ko-KR", "name": "Korean"},
+    {"code": "zh-CN", "name": "Chinese (Simplified)"},
+    {"code": "hi-IN", "name": "Hindi"},
+    {"code": "ar-SA", "name": "Arabic"},
+    {"code": "nl-NL", "name": "Dutch"},
+    {"code": "ru-RU", "name": "Russian"}
+)
+
+# Static payloads serialized once at import - their endpoints just hand
+# the bytes back instead of re-encoding the same JSON per request
+_LANGUAGES_BYTES = orjson.dumps({"languages": SUPPORTED_LANGUAGES})
+_ROOT_BYTES = orjson.dumps({"message": "Talk to PDF API is running!", "version": "1.0.0"})
+
+# One HTTP/2 connection pool shared by every httpx-backed service:
+# concurrent upstream calls multiplex over kept-alive connections instead
+# of each service paying its own TLS handshakes. (The Gemini SDK manages
+# its own transport and cannot take this client.)
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=30.0
+)
 
 # Initialize services
 pdf_service = PDFService()
 gemini_service = GeminiService()
-murf_service = MurfService()
+murf_service = MurfService(http_client=http_client)
 voice_service = VoiceService()
 
+# Micro-batcher for chat requests: items arriving within a short window are
+# coalesced into one batch_generate_chat_response call (fanned out under the
+# service's semaphore over kept-alive connections) instead of N independent
+# round-trips racing each other into the rate limit
+# Per-upstream concurrency bounds: at most K in-flight calls per provider,
+# with excess requests parked cheaply on the semaphore instead of fanning
+# out into rate limits and retry storms upstream
+GEMINI_SEM = asyncio.Semaphore(int(os.getenv("GEMINI_ENDPOINT_CONCURRENCY", 20)))
+MURF_SEM = asyncio.Semaphore(int(os.getenv("MURF_ENDPOINT_CONCURRENCY", 10)))
+
+# Blocking Murf SDK calls run on their own small pool - the default
+# executor is shared with file IO and sync validators, so a slow upstream
+# there would starve unrelated requests
+MURF_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="murf-sdk")
+
+CHAT_BATCH_MAX = int(os.getenv("CHAT_BATCH_MAX", 16))
+CHAT_BATCH_WAIT_MS = int(os.getenv("CHAT_BATCH_WAIT_MS", 20))
+_chat_queue: asyncio.Queue = asyncio.Queue()
+_chat_worker = None
+
+async def _chat_batch_worker():
+    """Drain chat items in small windows and resolve each awaiter's future"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _chat_queue.get()]
+        deadline = loop.time() + CHAT_BATCH_WAIT_MS / 1000
+        while len(batch) < CHAT_BATCH_MAX:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_chat_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # A failed flush resolves the whole batch instead of killing the
+        # worker and stranding its futures
+        try:
+            results = await gemini_service.batch_generate_chat_response([item for item, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            continue
+
+        for (_, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+async def _batched_chat_response(item: dict) -> str:
+    """Queue a chat item and await its batched result"""
+    global _chat_worker
+    # Lazy worker start - there's no running loop at import time
+    if _chat_worker is None or _chat_worker.done():
+        _chat_worker = asyncio.get_running_loop().create_task(_chat_batch_worker())
+
+    fut = asyncio.get_running_loop().create_future()
+    await _chat_queue.put((item, fut))
+    return await fut
+
+# Speculative voice pipeline: Gemini streams the answer and each completed
+# sentence goes to Murf immediately, so synthesis overlaps generation
+# instead of waiting for the full response. SPECULATIVE_TTS=0 forces the
+# serial transcribe -> generate -> synthesize path.
+SPECULATIVE_TTS = os.getenv("SPECULATIVE_TTS", "1") != "0"
+_SENTENCE_BOUNDARY_RE = re.compile(r'(?<=[.!?])\s+')
+
+def _concat_audio(paths: list) -> str:
+    """Join per-sentence MP3s into one file and return its /audio URL (blocking)"""
+    key = hashlib.blake2b(
+        "|".join(os.path.basename(p) for p in paths).encode('utf-8'), digest_size=16
+    ).hexdigest()
+    out_path = os.path.join(AUDIO_DIR, f"murf_joined_{key}.mp3")
+    if not os.path.exists(out_path):
+        combined = AudioSegment.empty()
+        for path in paths:
+            combined += AudioSegment.from_mp3(path)
+        combined.export(out_path, format="mp3")
+    return f"/audio/{os.path.basename(out_path)}"
+
+async def _try_synthesize(text: str, voice_id: str, language: str, speed: float = None) -> tuple:
+    """Synthesize text with Murf; returns (audio_url, error) with exactly one set.
+
+    Single funnel for the endpoints that treat synthesis failure as
+    degradation rather than a hard error, so each handler doesn't carry
+    its own nested try/except around the Murf call.
+    """
+    try:
+        async with MURF_SEM:
+            synth = await murf_service.text_to_speech(
+                text=text, voice_id=voice_id, language=language, speed=speed
+            )
+        return synth.url, None
+    except Exception as e:
+        logger.exception("Voice synthesis failed for voice %s", voice_id)
+        return None, str(e)
+
+async def _speculative_voice_chat(message: str, context: str, language: str,
+                                  voice_id: str, chat_history: list = []) -> tuple:
+    """Stream the Gemini answer and synthesize sentences as they complete.
+
+    Per-sentence TTS starts while Gemini is still writing the rest of the
+    answer, so end-to-end latency approaches max(generation, synthesis)
+    instead of their sum. Returns (full_text, audio_url); raises so the
+    caller can fall back to the serial path.
+    """
+    tts_tasks = []
+    parts = []
+    buffer = ""
+
+    async def _tts(piece: str):
+        async with MURF_SEM:
+            return await murf_service.text_to_speech(
+                text=piece, voice_id=voice_id, language=language
+            )
+
+    def _synthesize(piece: str):
+        piece = piece.strip()
+        if piece:
+            tts_tasks.append(asyncio.create_task(_tts(piece)))
+
+    try:
+        async with GEMINI_SEM:
+            async for chunk in gemini_service.generate_chat_response_stream(
+                message=message, context=context, language=language, chat_history=chat_history
+            ):
+                parts.append(chunk)
+                buffer += chunk
+                # Peel off completed sentences; the tail stays buffered
+                # until the next boundary arrives
+                boundaries = list(_SENTENCE_BOUNDARY_RE.finditer(buffer))
+                if boundaries:
+                    cut = boundaries[-1].end()
+                    for sentence in _SENTENCE_BOUNDARY_RE.split(buffer[:cut]):
+                        _synthesize(sentence)
+                    buffer = buffer[cut:]
+        _synthesize(buffer)
+
+        full_text = "".join(parts).strip()
+        if not full_text:
+            raise ValueError("Empty streamed response")
+
+        results = await asyncio.gather(*tts_tasks)
+        if len(results) == 1:
+            return full_text, results[0].url
+        audio_url = await asyncio.to_thread(_concat_audio, [r.path for r in results])
+        return full_text, audio_url
+
+    except Exception:
+        for task in tts_tasks:
+            task.cancel()
+        raise
+
 # Health check
 @app.get("/")
 async def root():
-    return {"message": "Talk to PDF API is running!", "version": "1.0.0"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
     """Check the health of all services"""
     try:
-        gemini_status = await gemini_service.test_connection()
+        # The two upstream probes are independent - run them concurrently
+        gemini_status, murf_voices = await asyncio.gather(
+            gemini_service.test_connection(),
+            murf_service.get_available_voices(),
+            return_exceptions=True
+        )
         return {
             "status": "healthy",
             "services": {
-                "gemini": "connected" if gemini_status else "disconnected",
+                "gemini": "connected" if gemini_status is True else "disconnected",
                 "pdf_processor": "ready",
-                "murf_api": "configured",
+                "murf_api": "error" if isinstance(murf_voices, Exception) else "configured",
                 "voice_service": "ready"
             }
         }
@@ -89,51 +375,80 @@ async def upload_pdf(file: UploadFile = File(...)):
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
-        # Save uploaded file
+        # Save uploaded file (file_id is the SHA-256 of the bytes)
         file_path = await pdf_service.save_uploaded_file(file)
-        
+        file_id = os.path.basename(file_path).split('.')[0]
+
+        # Short-circuit on previously processed content
+        cached = _upload_cache.get(file_id)
+        if cached is None:
+            cache_path = os.path.join(UPLOAD_CACHE_DIR, f"{file_id}.json")
+            if os.path.exists(cache_path):
+                with open(cache_path) as f:
+                    cached = json.load(f)
+                _upload_cache[file_id] = cached
+        if cached is not None:
+            return {"filename": file.filename, **cached}
+
         # Extract text from PDF
         extracted_text = await pdf_service.extract_text(file_path)
-        
+
         # Generate document summary using Gemini
-        summary = await gemini_service.generate_summary(extracted_text)
-        
-        return {
-            "filename": file.filename,
-            "file_id": os.path.basename(file_path).split('.')[0],
+        async with GEMINI_SEM:
+            summary = await gemini_service.generate_summary(extracted_text)
+
+        result = {
+            "file_id": file_id,
             "text_length": len(extracted_text),
             "summary": summary,
             "status": "processed"
         }
-    
+        _upload_cache[file_id] = result
+        with open(os.path.join(UPLOAD_CACHE_DIR, f"{file_id}.json"), 'w') as f:
+            json.dump(result, f)
+
+        return {"filename": file.filename, **result}
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing PDF: {str(e)}")
 
+async def _chat_impl(request: ChatRequest) -> str:
+    """Context fetch plus batched Gemini call, shared by the chat endpoints.
+
+    Returning the bare string lets internal callers (voice chat) skip the
+    response shaping the HTTP endpoint does.
+    """
+    context = ""
+    if request.file_id:
+        context = await pdf_service.get_pdf_context(request.file_id)
+
+    async with GEMINI_SEM:
+        return await _batched_chat_response({
+            "message": request.message,
+            "context": context,
+            "language": request.language,
+            "chat_history": request.chat_history,
+            "session_id": request.session_id
+        })
+
 # Chat with PDF
-@app.post("/chat", response_model=ChatResponse)
+@app.post("/chat")
 async def chat_with_pdf(request: ChatRequest):
     """Chat with the uploaded PDF using AI"""
     try:
-        # Get PDF context if file_id provided
-        context = ""
-        if request.file_id:
-            context = await pdf_service.get_pdf_context(request.file_id)
-        
-        # Generate AI response
-        ai_response = await gemini_service.generate_chat_response(
-            message=request.message,
-            context=context,
-            language=request.language,
-            chat_history=request.chat_history
-        )
-        
-        return ChatResponse(
-            response=ai_response,
-            language=request.language,
-            timestamp=request.timestamp or "",
-            file_id=request.file_id
-        )
-    
+        ai_response = await _chat_impl(request)
+
+        # Plain dict straight to orjson: with response_model=ChatResponse
+        # the answer was built as a model, re-validated by the response
+        # machinery and run through jsonable_encoder - three passes over
+        # the same four fields per request
+        return {
+            "response": ai_response,
+            "language": request.language,
+            "timestamp": request.timestamp or "",
+            "file_id": request.file_id
+        }
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating response: {str(e)}")
 
@@ -141,35 +456,60 @@ async def chat_with_pdf(request: ChatRequest):
 @app.post("/synthesize-voice")
 async def synthesize_voice(request: VoiceRequest):
     """Convert text to speech using Murf API"""
-    try:
-        audio_file_path = await murf_service.text_to_speech(
-            text=request.text,
-            voice_id=request.voice_id,
-            language=request.language,
-            speed=request.speed
-        )
-        
-        return {
-            "audio_url": f"/audio/{os.path.basename(audio_file_path)}",
-            "status": "success",
-            "voice_id": request.voice_id,
-            "language": request.language
-        }
-    
-    except Exception as e:
-        print(f"Voice synthesis error: {str(e)}")
+    audio_url, voice_error = await _try_synthesize(
+        request.text, request.voice_id, request.language, request.speed
+    )
+
+    if voice_error:
         raise HTTPException(
             status_code=500,
             detail={
                 "status": "error",
-                "message": str(e),
+                "message": voice_error,
                 "voice_id": request.voice_id,
                 "language": request.language
             }
         )
-    
+
+    return {
+        "audio_url": audio_url,
+        "status": "success",
+        "voice_id": request.voice_id,
+        "language": request.language
+    }
+
+@app.post("/synthesize-voice/stream")
+async def synthesize_voice_stream(request: VoiceRequest):
+    """Stream synthesized speech to the client as Murf produces it.
+
+    Playback can start on the first chunk instead of waiting for the full
+    file plus a second round-trip to /audio; the service tees the stream
+    into the same cache the URL-based endpoint serves from.
+    """
+    stream = murf_service.text_to_speech_stream(
+        text=request.text,
+        voice_id=request.voice_id,
+        language=request.language,
+        speed=request.speed
+    )
+
+    # Pull the first chunk before committing to a 200, so synthesis
+    # failures still surface as an HTTP error instead of a dead stream
+    try:
+        async with MURF_SEM:
+            first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="Murf returned no audio data")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error synthesizing voice: {str(e)}")
+        logger.exception("Voice synthesis failed for voice %s", request.voice_id)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def _body():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(_body(), media_type="audio/mpeg")
 
 # Voice input (Speech to Text)
 @app.post("/transcribe-audio")
@@ -178,13 +518,15 @@ async def transcribe_audio(audio: UploadFile = File(...)):
     try:
         # Save audio file temporarily
         audio_path = await voice_service.save_audio_file(audio)
-        
-        # Transcribe audio to text
-        transcription = await voice_service.transcribe_audio(audio_path)
-        
-        # Clean up temporary file
-        os.remove(audio_path)
-        
+
+        # Transcribe audio to text; the unlink runs in a thread so the
+        # event loop never blocks on the filesystem, and in a finally so
+        # failed transcriptions don't leak temp files
+        try:
+            transcription = await voice_service.transcribe_audio(audio_path)
+        finally:
+            await asyncio.to_thread(os.unlink, audio_path)
+
         return {
             "transcription": transcription,
             "status": "success"
@@ -198,36 +540,45 @@ async def transcribe_audio(audio: UploadFile = File(...)):
 async def voice_chat(request: ChatRequest):
     """Complete voice chat pipeline: text input -> AI response -> voice synthesis"""
     try:
-        # Generate AI response
-        chat_response = await chat_with_pdf(request)
-        
-        # Synthesize voice response
-        try:
-            audio_file_path = await murf_service.text_to_speech(
-                text=chat_response.response,
-                voice_id=request.voice_id or "en-US-julia",
-                language=request.language
-            )
-            
-            return {
-                "text_response": chat_response.response,
-                "audio_url": f"/audio/{os.path.basename(audio_file_path)}",
-                "status": "success",
-                "language": request.language,
-                "voice_id": request.voice_id or "en-US-julia"
-            }
-            
-        except Exception as voice_error:
-            # If voice synthesis fails, still return the text response
-            return {
-                "text_response": chat_response.response,
-                "audio_url": None,
-                "status": "voice_synthesis_failed",
-                "error": str(voice_error),
-                "language": request.language,
-                "voice_id": request.voice_id or "en-US-julia"
-            }
-    
+        # Overlap generation and synthesis when streaming is enabled
+        if SPECULATIVE_TTS:
+            try:
+                context = ""
+                if request.file_id:
+                    context = await pdf_service.get_pdf_context(request.file_id)
+                text_response, audio_url = await _speculative_voice_chat(
+                    request.message, context, request.language,
+                    request.voice_id or "en-US-julia", request.chat_history
+                )
+                return {
+                    "text_response": text_response,
+                    "audio_url": audio_url,
+                    "status": "success",
+                    "language": request.language,
+                    "voice_id": request.voice_id or "en-US-julia"
+                }
+            except Exception as speculative_error:
+                logger.warning("Speculative voice pipeline failed, using serial path: %s", speculative_error)
+
+        # Generate AI response without the ChatResponse model round-trip
+        text_response = await _chat_impl(request)
+
+        # Synthesize voice; a failed synthesis still returns the text
+        audio_url, voice_error = await _try_synthesize(
+            text_response, request.voice_id or "en-US-julia", request.language
+        )
+
+        response = {
+            "text_response": text_response,
+            "audio_url": audio_url,
+            "status": "success" if audio_url else "voice_synthesis_failed",
+            "language": request.language,
+            "voice_id": request.voice_id or "en-US-julia"
+        }
+        if voice_error:
+            response["error"] = voice_error
+        return response
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in voice chat: {str(e)}")
 
@@ -236,55 +587,68 @@ async def voice_chat(request: ChatRequest):
 async def call_with_pdf(audio: UploadFile = File(...), file_id: str = None, language: str = "en-US", voice_id: str = "en-US-julia"):
     """Call with PDF: Complete pipeline - audio input -> transcribe -> AI response -> voice synthesis"""
     try:
-        # Step 1: Transcribe audio input to text
+        # Step 1: Transcribe audio input to text, fetching the PDF context
+        # concurrently so the lookup hides behind ASR latency
         audio_path = await voice_service.save_audio_file(audio)
-        user_message = await voice_service.transcribe_audio(audio_path)
-        os.remove(audio_path)  # Clean up
-        
+        ctx_task = asyncio.create_task(pdf_service.get_pdf_context(file_id)) if file_id else None
+        try:
+            user_message = await voice_service.transcribe_audio(audio_path)
+        finally:
+            # Threaded unlink keeps the loop free; finally keeps failed
+            # transcriptions from leaking temp files
+            await asyncio.to_thread(os.unlink, audio_path)
+
         if not user_message or user_message.strip() == "":
+            if ctx_task:
+                ctx_task.cancel()
             raise HTTPException(status_code=400, detail="Could not transcribe audio or audio is empty")
-        
-        # Step 2: Get PDF context if file_id provided
-        context = ""
-        if file_id:
-            context = await pdf_service.get_pdf_context(file_id)
-        
+
+        # Step 2: PDF context, if requested
+        context = await ctx_task if ctx_task else ""
+
+        # Steps 3+4 overlapped: synthesis starts on the first sentences
+        # while Gemini is still generating the rest
+        if SPECULATIVE_TTS:
+            try:
+                ai_response, audio_url = await _speculative_voice_chat(
+                    user_message, context, language, voice_id
+                )
+                return {
+                    "user_message": user_message,
+                    "ai_response": ai_response,
+                    "audio_url": audio_url,
+                    "status": "success",
+                    "language": language,
+                    "voice_id": voice_id
+                }
+            except Exception as speculative_error:
+                logger.warning("Speculative voice pipeline failed, using serial path: %s", speculative_error)
+
         # Step 3: Generate AI response using the transcribed text
-        ai_response = await gemini_service.generate_chat_response(
-            message=user_message,
-            context=context,
-            language=language,
-            chat_history=[]
-        )
-        
-        # Step 4: Synthesize AI response to voice
-        try:
-            audio_file_path = await murf_service.text_to_speech(
-                text=ai_response,
-                voice_id=voice_id,
-                language=language
+        async with GEMINI_SEM:
+            ai_response = await gemini_service.generate_chat_response(
+                message=user_message,
+                context=context,
+                language=language,
+                chat_history=[]
             )
-            
-            return {
-                "user_message": user_message,
-                "ai_response": ai_response,
-                "audio_url": f"/audio/{os.path.basename(audio_file_path)}",
-                "status": "success",
-                "language": language,
-                "voice_id": voice_id
-            }
-            
-        except Exception as voice_error:
-            return {
-                "user_message": user_message,
-                "ai_response": ai_response,
-                "audio_url": None,
-                "status": "voice_synthesis_failed",
-                "error": str(voice_error),
-                "language": language,
-                "voice_id": voice_id
-            }
-    
+        
+        # Step 4: Synthesize AI response to voice; a failed synthesis
+        # still returns the text
+        audio_url, voice_error = await _try_synthesize(ai_response, voice_id, language)
+
+        response = {
+            "user_message": user_message,
+            "ai_response": ai_response,
+            "audio_url": audio_url,
+            "status": "success" if audio_url else "voice_synthesis_failed",
+            "language": language,
+            "voice_id": voice_id
+        }
+        if voice_error:
+            response["error"] = voice_error
+        return response
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error in call with PDF: {str(e)}")
 
@@ -293,30 +657,38 @@ async def call_with_pdf(audio: UploadFile = File(...), file_id: str = None, lang
 async def get_available_voices():
     """Get list of available voices from Murf API"""
     try:
+        # The service layer already TTL-caches the Murf fetch behind a lock;
+        # the header lets browsers/CDNs skip the request entirely for an hour
         voices = await murf_service.get_available_voices()
-        return {"voices": voices}
-    
+        return ORJSONResponse(
+            {"voices": voices},
+            headers={"Cache-Control": "public, max-age=3600"}
+        )
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching voices: {str(e)}")
 
 # Test endpoint to fetch real Murf voices
+_real_voices_cache = None  # (fetched_at, voices)
+
 @app.get("/voices/real")
 async def get_real_murf_voices():
     """Test endpoint to fetch actual voices from Murf API"""
+    global _real_voices_cache
     try:
         if not murf_service.client:
             return {"error": "Murf API not configured", "voices": []}
-        
-        # Try to get real voices
-        def get_voices():
-            return murf_service.client.voices.list()
-        
-        import asyncio
-        loop = asyncio.get_event_loop()
-        voices_response = await loop.run_in_executor(None, get_voices)
-        
+
+        # The catalog changes rarely - serve the last fetch for an hour
+        if _real_voices_cache and time.monotonic() - _real_voices_cache[0] < 3600:
+            return {"voices": _real_voices_cache[1]}
+
+        loop = asyncio.get_running_loop()
+        voices_response = await loop.run_in_executor(MURF_POOL, murf_service.client.voices.list)
+
+        _real_voices_cache = (time.monotonic(), voices_response)
         return {"voices": voices_response}
-    
+
     except Exception as e:
         return {"error": str(e), "voices": []}
 
@@ -324,25 +696,11 @@ async def get_real_murf_voices():
 @app.get("/languages")
 async def get_supported_languages():
     """Get list of supported languages"""
-    return {
-        "languages": [
-            {"code": "en-US", "name": "English (US)"},
-            {"code": "en-GB", "name": "English (UK)"},
-            {"code": "es-ES", "name": "Spanish (Spain)"},
-            {"code": "es-MX", "name": "Spanish (Mexico)"},
-            {"code": "fr-FR", "name": "French"},
-            {"code": "de-DE", "name": "German"},
-            {"code": "it-IT", "name": "Italian"},
-            {"code": "pt-BR", "name": "Portuguese (Brazil)"},
-            {"code": "ja-JP", "name": "Japanese"},
-            {"code": "ko-KR", "name": "Korean"},
-            {"code": "zh-CN", "name": "Chinese (Simplified)"},
-            {"code": "hi-IN", "name": "Hindi"},
-            {"code": "ar-SA", "name": "Arabic"},
-            {"code": "nl-NL", "name": "Dutch"},
-            {"code": "ru-RU", "name": "Russian"}
-        ]
-    }
+    return Response(
+        content=_LANGUAGES_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=86400, immutable"}
+    )
 
 if __name__ == "__main__":
     import uvicorn